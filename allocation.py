@@ -0,0 +1,112 @@
+import argparse
+import csv
+import random
+
+from batch import find_course, find_student
+from models import MAX_COURSES
+from task_3_advisor_approval import enrol, restore_state, save_state
+
+
+def allocate(students, preferences, seed=0, max_courses=MAX_COURSES):
+    # Lottery-seeded round-robin serial dictatorship. A seeded lottery fixes an
+    # order, then every student takes their best remaining choice once per
+    # round, with the order reversed on alternate rounds so the lottery winner
+    # does not take all four seats before anyone else picks. Returns
+    # {student_id: [course, ...]} and never exceeds the seats left in a course
+    # or a student's remaining course allowance.
+    order = [student for student in students if preferences.get(student.student_id)]
+    random.Random(seed).shuffle(order)
+    seats = {}
+    allocation = {student.student_id: [] for student in order}
+    pointers = dict.fromkeys(allocation, 0)
+    active = [student for student in order if len(student.enrolled_courses) < max_courses]
+
+    for round_number in range(max_courses):
+        if not active:
+            break
+        still_active = []
+        for student in (reversed(active) if round_number % 2 else active):
+            choices = preferences[student.student_id]
+            taken = allocation[student.student_id]
+            i = pointers[student.student_id]
+            while i < len(choices):
+                course = choices[i]
+                i += 1
+                if course in taken or course.course_name in student.enrolled_courses:
+                    continue
+                remaining = seats.get(course.course_code)
+                if remaining is None:
+                    remaining = course.max_capacity - len(course.enrolled_students)
+                if remaining > 0:
+                    seats[course.course_code] = remaining - 1
+                    taken.append(course)
+                    break
+                seats[course.course_code] = 0
+            pointers[student.student_id] = i
+            if i < len(choices) and len(student.enrolled_courses) + len(taken) < max_courses:
+                still_active.append(student)
+        active = still_active[::-1] if round_number % 2 else still_active
+    return allocation
+
+
+def apply_allocation(registry, allocation, log=None):
+    # Goes through enrol() so postgraduates are still routed to their advisor.
+    results = []
+    for student_id, courses in allocation.items():
+        student = registry.get_student_by_id(student_id)
+        for course in courses:
+            results.append((student_id, course.course_code, enrol(registry, student, course, log)))
+    return results
+
+
+def read_preferences(file_name, registry):
+    # Rows are student followed by ranked courses, like advisors.csv. Students
+    # and courses may be given by id/code or by name.
+    preferences = {}
+    with open(file_name, 'r', newline='') as preference_file:
+        csv_reader = csv.reader(preference_file)
+        next(csv_reader, None)
+        for row in csv_reader:
+            if not row:
+                continue
+            student = find_student(registry, row[0].strip())
+            if student is None:
+                print(f'Warning: student "{row[0]}" is unknown or not unique, skipped.')
+                continue
+            courses = []
+            for key in row[1:]:
+                course = find_course(registry, key.strip())
+                if course is None:
+                    print(f'Warning: course "{key}" for student "{row[0]}" is unknown or not unique, skipped.')
+                else:
+                    courses.append(course)
+            preferences[student.student_id] = courses
+    return preferences
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Allocate seats from ranked course preferences.")
+    parser.add_argument("preferences", help="CSV of student,course,course,... in order of preference")
+    parser.add_argument("-o", "--output", default="allocation.csv", help="result file")
+    parser.add_argument("--seed", type=int, default=0, help="lottery seed")
+    args = parser.parse_args(argv)
+
+    registry, log = restore_state(batch_size=4096, batch_interval=1.0)
+    try:
+        preferences = read_preferences(args.preferences, registry)
+        allocation = allocate(registry.students, preferences, args.seed)
+        results = apply_allocation(registry, allocation, log)
+    finally:
+        save_state(registry, log)
+        log.close()
+
+    with open(args.output, 'w', newline='') as result_file:
+        csv_writer = csv.writer(result_file)
+        csv_writer.writerow(["student", "course", "status"])
+        csv_writer.writerows(results)
+    print(f"Allocated {len(results)} seats to {sum(1 for courses in allocation.values() if courses)} students. "
+          f"Results in {args.output}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+import argparse
+from itertools import chain
+
+import numpy as np
+
+from arrays import positions
+from models import MAX_ADVISEES, MAX_COURSES
+from task_3_advisor_approval import restore_state
+
+
+class EnrolmentArrays:
+    # The registry exported as NumPy arrays. Students, courses and advisors
+    # are numbered by their position in the registry lists. Enrolments are a
+    # sparse course x student incidence matrix in CSR form: the students of
+    # course c are indices[indptr[c]:indptr[c + 1]]. This is the only part
+    # that loops in Python; every aggregate below is vectorised.
+    def __init__(self, registry):
+        students, courses, advisors = registry.students, registry.courses, registry.advisors
+        addresses = np.fromiter(map(id, students), np.uint64, len(students))
+        self.__student_ids = [student.student_id for student in students]
+        self.__course_codes = [course.course_code for course in courses]
+        self.__advisor_names = [advisor.advisor_name for advisor in advisors]
+        student_types = [student.student_type for student in students]
+        postgraduate = {student_type: student_type.lower() == "postgraduate" for student_type in set(student_types)}
+        self.__postgraduate = np.fromiter(map(postgraduate.__getitem__, student_types), bool, len(students))
+        self.__capacity = np.fromiter((course.max_capacity for course in courses), np.int64, len(courses))
+        self.__indptr = np.zeros(len(courses) + 1, np.int64)
+        np.cumsum(np.fromiter((len(course.enrolled_students) for course in courses), np.int64, len(courses)),
+                  out=self.__indptr[1:])
+        self.__indices = positions(addresses, chain.from_iterable(course.enrolled_students for course in courses),
+                                   int(self.__indptr[-1]))
+        self.__advisees = np.fromiter((len(advisor.assigned_students) for advisor in advisors), np.int64, len(advisors))
+        self.__pending = np.fromiter((len(advisor.pending_requests) for advisor in advisors), np.int64, len(advisors))
+        self.__advised = np.zeros(len(students), bool)
+        self.__advised[positions(addresses, chain.from_iterable(advisor.assigned_students for advisor in advisors),
+                                 int(self.__advisees.sum()))] = True
+
+    @property
+    def student_ids(self):
+        return self.__student_ids
+
+    @property
+    def course_codes(self):
+        return self.__course_codes
+
+    @property
+    def advisor_names(self):
+        return self.__advisor_names
+
+    @property
+    def postgraduate(self):
+        return self.__postgraduate
+
+    @property
+    def capacity(self):
+        return self.__capacity
+
+    @property
+    def indptr(self):
+        return self.__indptr
+
+    @property
+    def indices(self):
+        return self.__indices
+
+    @property
+    def advisees(self):
+        return self.__advisees
+
+    @property
+    def pending(self):
+        return self.__pending
+
+    @property
+    def advised(self):
+        return self.__advised
+
+    def enrolled(self):
+        return np.diff(self.__indptr)
+
+    def course_of_enrolment(self):
+        # Row number of every stored enrolment, aligned with indices.
+        return np.repeat(np.arange(len(self.__capacity)), self.enrolled())
+
+    def courses_per_student(self):
+        return np.bincount(self.__indices, minlength=len(self.__postgraduate))
+
+
+def fill_rates(arrays):
+    enrolled = arrays.enrolled()
+    return np.divide(enrolled, arrays.capacity, out=np.zeros(len(enrolled)), where=arrays.capacity > 0)
+
+
+def postgraduates_per_course(arrays):
+    return np.bincount(arrays.course_of_enrolment(), weights=arrays.postgraduate[arrays.indices],
+                       minlength=len(arrays.capacity)).astype(np.int64)
+
+
+def summarise(arrays, top=5):
+    enrolled = arrays.enrolled()
+    rates = fill_rates(arrays)
+    postgraduates = postgraduates_per_course(arrays)
+    per_student = arrays.courses_per_student()
+    fullest = np.argsort(-rates, kind="stable")[:top]
+    return {
+        "courses": len(arrays.capacity),
+        "seats": int(arrays.capacity.sum()),
+        "enrolled": int(enrolled.sum()),
+        "full_courses": int((enrolled >= arrays.capacity).sum()),
+        "empty_courses": int((enrolled == 0).sum()),
+        "fill_rate_quartiles": [float(value) for value in np.percentile(rates, [0, 25, 50, 75, 100])] if len(rates) else [],
+        "fullest": [(arrays.course_codes[n], float(rates[n])) for n in fullest],
+        "students": len(per_student),
+        "postgraduates": int(arrays.postgraduate.sum()),
+        "postgraduate_enrolments": int(postgraduates.sum()),
+        "mostly_postgraduate_courses": int((2 * postgraduates > enrolled).sum()),
+        "courses_per_student": np.bincount(np.minimum(per_student, MAX_COURSES), minlength=MAX_COURSES + 1).tolist(),
+        "below_allowance": int((per_student < MAX_COURSES).sum()),
+        "unused_allowance": int(np.maximum(MAX_COURSES - per_student, 0).sum()),
+        "advisors": len(arrays.advisees),
+        "advisees_per_advisor": np.bincount(np.minimum(arrays.advisees, MAX_ADVISEES), minlength=MAX_ADVISEES + 1).tolist(),
+        "advisors_at_cap": int((arrays.advisees >= MAX_ADVISEES).sum()),
+        "pending_requests": int(arrays.pending.sum()),
+        "postgraduates_without_advisor": int((arrays.postgraduate & ~arrays.advised).sum()),
+    }
+
+
+def percent(part, whole):
+    return f"{100 * part / whole:.1f}%" if whole else "n/a"
+
+
+def print_summary(summary):
+    print(f"Courses: {summary['courses']}, seats: {summary['seats']}, enrolled: {summary['enrolled']} "
+          f"({percent(summary['enrolled'], summary['seats'])} full)")
+    print(f"  Full courses: {summary['full_courses']}, empty courses: {summary['empty_courses']}")
+    if summary["fill_rate_quartiles"]:
+        print("  Fill rate min/25%/median/75%/max: " + " / ".join(f"{rate:.0%}" for rate in summary["fill_rate_quartiles"]))
+    for course_code, rate in summary["fullest"]:
+        print(f"  {course_code}: {rate:.0%}")
+    undergraduates = summary["students"] - summary["postgraduates"]
+    print(f"Students: {summary['students']} ({summary['postgraduates']} postgraduate, {undergraduates} undergraduate)")
+    print(f"  Postgraduate share of enrolments: {percent(summary['postgraduate_enrolments'], summary['enrolled'])}, "
+          f"courses with a postgraduate majority: {summary['mostly_postgraduate_courses']}")
+    print("  Students by number of courses: " +
+          ", ".join(f"{count}: {students}" for count, students in enumerate(summary["courses_per_student"])))
+    print(f"  Below the {MAX_COURSES}-course allowance: {summary['below_allowance']} students, "
+          f"{summary['unused_allowance']} unused places")
+    print(f"Advisors: {summary['advisors']}, at the {MAX_ADVISEES}-student cap: {summary['advisors_at_cap']}")
+    print("  Advisors by number of students: " +
+          ", ".join(f"{count}: {advisors}" for count, advisors in enumerate(summary["advisees_per_advisor"])))
+    print(f"  Pending requests: {summary['pending_requests']}, "
+          f"postgraduates without an advisor: {summary['postgraduates_without_advisor']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print fill rates, student mix and advisor load.")
+    parser.add_argument("--top", type=int, default=5, help="number of fullest courses to list")
+    args = parser.parse_args(argv)
+    registry, log = restore_state()
+    log.close()
+    print_summary(summarise(EnrolmentArrays(registry), args.top))
+
+
+if __name__ == "__main__":
+    main()
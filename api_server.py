@@ -0,0 +1,226 @@
+import argparse
+import asyncio
+import json
+import signal
+from urllib.parse import parse_qs, unquote
+
+from batch import LookupFailed, lookup
+from oplog import COMPACT_EVERY
+from report import course_json, student_json
+from task_3_advisor_approval import approve_many, deny_many, drop, enrol, enrol_bundle, restore_state, save_state
+
+MAX_BODY = 1 << 20
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 409: "Conflict", 413: "Payload Too Large",
+           500: "Internal Server Error"}
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class EnrolmentApi:
+    # All model calls run on the event loop thread, so each request applies
+    # atomically without any locking.
+    def __init__(self, registry, log=None):
+        self.__registry = registry
+        self.__log = log
+
+    def __resolve(self, body):
+        try:
+            request = json.loads(body or b"{}")
+            student_key = str(request["student"]).strip()
+            course_key = str(request["course"]).strip()
+        except (ValueError, KeyError, TypeError):
+            raise ApiError(400, 'body must be JSON with "student" and "course"') from None
+        return self.__lookup("student", student_key), self.__lookup("course", course_key)
+
+    def __lookup(self, kind, key):
+        try:
+            return lookup(self.__registry, kind, key)
+        except LookupFailed as error:
+            raise ApiError(409 if error.shared else 404, str(error)) from None
+
+    def __request_ids(self, advisor, body):
+        # {"requests": [id, ...]} or {"requests": "all"}; None when the body
+        # names a single student and course instead.
+        try:
+            requests = json.loads(body or b"{}").get("requests")
+        except (ValueError, AttributeError):
+            raise ApiError(400, "body must be a JSON object") from None
+        if requests is None:
+            return None
+        if requests == "all":
+            return [request_id for request_id, _, _ in advisor.pending_requests.items()]
+        # bool is a subclass of int, but true is not request 1.
+        if not isinstance(requests, list) or not all(isinstance(request_id, int) and not isinstance(request_id, bool)
+                                                     for request_id in requests):
+            raise ApiError(400, '"requests" must be a list of request ids or "all"')
+        return requests
+
+    def __advisor(self, name):
+        advisor = self.__registry.get_advisor_by_name(name)
+        if advisor is None:
+            raise ApiError(404, f'advisor "{name}" not found')
+        return advisor
+
+    def __roster(self, course, query):
+        # ?sort=time|id|name&type=...&limit=N&cursor=<next_cursor from the
+        # previous page>. Without a limit the whole roster is returned.
+        options = {name: values[-1] for name, values in parse_qs(query).items()}
+        try:
+            cursor = json.loads(options["cursor"]) if "cursor" in options else None
+            limit = int(options["limit"]) if "limit" in options else None
+            students, next_cursor = course.roster.page(options.get("sort", "time"), options.get("type"), cursor, limit)
+        except (ValueError, TypeError) as error:
+            raise ApiError(400, f"invalid roster query: {error}") from None
+        result = course_json(course)
+        result["students"] = [student_json(student) for student in students]
+        result["next_cursor"] = next_cursor
+        return result
+
+    def dispatch(self, method, path, body):
+        path, _, query = path.partition("?")
+        parts = [unquote(part) for part in path.strip("/").split("/")]
+        route = (method, *parts)
+        if route in (("POST", "enrol"), ("POST", "reenrol")):
+            student, course = self.__resolve(body)
+            return {"status": enrol(self.__registry, student, course, self.__log)}
+        if route == ("POST", "enrol-bundle"):
+            # {"student": ..., "courses": [code or name, ...]}; all or nothing.
+            try:
+                request = json.loads(body or b"{}")
+                student_key = str(request["student"]).strip()
+                if not isinstance(request["courses"], list):
+                    raise TypeError
+                course_keys = [str(key).strip() for key in request["courses"]]
+            except (ValueError, KeyError, TypeError):
+                raise ApiError(400, 'body must be JSON with "student" and a "courses" list') from None
+            if not course_keys:
+                raise ApiError(400, '"courses" must not be empty')
+            student = self.__lookup("student", student_key)
+            courses = [self.__lookup("course", key) for key in course_keys]
+            status, course = enrol_bundle(self.__registry, student, courses, self.__log)
+            return {"status": status, "course": course.course_code if course else None}
+        if route == ("POST", "drop"):
+            student, course = self.__resolve(body)
+            return {"status": drop(student, course, self.__log)}
+        if route == ("GET", "courses"):
+            return [course_json(course, with_students=True) for course in self.__registry.courses]
+        if method == "GET" and len(parts) == 3 and parts[0] == "courses" and parts[2] == "roster":
+            return self.__roster(self.__lookup("course", parts[1]), query)
+        if len(parts) == 3 and parts[0] == "advisors" and parts[2] == "requests" and method == "GET":
+            advisor = self.__advisor(parts[1])
+            return [{"request_id": request_id, "student": student_json(student), "course_code": course.course_code}
+                    for request_id, student, course in advisor.pending_requests.items()]
+        if len(parts) == 3 and parts[0] == "advisors" and parts[2] in ("approve", "deny") and method == "POST":
+            advisor = self.__advisor(parts[1])
+            request_ids = self.__request_ids(advisor, body)
+            action = approve_many if parts[2] == "approve" else deny_many
+            if request_ids is not None:
+                return {"results": {str(request_id): status
+                                    for request_id, status in action(advisor, request_ids, self.__log).items()}}
+            # A student and course name a request only if the advisor holds one for them.
+            student, course = self.__resolve(body)
+            request_id = advisor.pending_requests.find(student, course)
+            if request_id is None:
+                raise ApiError(404, f'{advisor.advisor_name} has no pending request from "{student.student_id}" '
+                                    f'for "{course.course_code}"')
+            return {"status": action(advisor, [request_id], self.__log)[request_id]}
+        raise ApiError(404, f"no route for {method} {path}")
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                headers = {}
+                for line in header_lines:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+                try:
+                    method, path, version = request_line.split(" ")
+                    length = int(headers.get("content-length", 0))
+                except ValueError:
+                    await self.respond(writer, 400, {"error": "malformed request"}, keep_alive=False)
+                    break
+                if length > MAX_BODY:
+                    await self.respond(writer, 413, {"error": "body too large"}, keep_alive=False)
+                    break
+                try:
+                    body = await reader.readexactly(length) if length else b""
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                try:
+                    status, payload = 200, self.dispatch(method, path, body)
+                except ApiError as error:
+                    status, payload = error.status, {"error": str(error)}
+                except Exception as error:
+                    # A bug in one request must not cost the client its answer.
+                    print(f"Warning: {method} {path} failed: {error!r}", flush=True)
+                    status, payload = 500, {"error": "internal error"}
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+                await self.respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, writer, status, payload, keep_alive=True):
+        body = json.dumps(payload).encode("utf-8")
+        writer.write(f"HTTP/1.1 {status} {REASONS.get(status, 'Error')}\r\n"
+                     f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                     f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + body)
+        await writer.drain()
+
+
+async def serve(host, port):
+    # Appends never fsync themselves; sync_log below does it for them.
+    registry, log = restore_state(batch_size=1 << 62, batch_interval=float("inf"))
+    api = EnrolmentApi(registry, log)
+    server = await asyncio.start_server(api.handle_connection, host, port, backlog=4096)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signal_number, stop.set)
+
+    async def sync_log():
+        # Group commit every 10 ms. The fsync runs on a worker thread, so
+        # clients are served while the disk catches up. The snapshot that
+        # compacts the log must see the registry standing still, so it runs
+        # on the loop: every COMPACT_EVERY records, all clients wait while it
+        # is written (about as long as save_state takes for the registry).
+        while True:
+            await asyncio.sleep(0.01)
+            await loop.run_in_executor(None, log.sync)
+            if log.records >= COMPACT_EVERY:
+                save_state(registry, log)
+
+    syncer = asyncio.create_task(sync_log())
+    print(f"Serving {len(registry.students)} students and {len(registry.courses)} courses on http://{host}:{port}",
+          flush=True)
+    async with server:
+        await stop.wait()
+    syncer.cancel()
+    save_state(registry, log)
+    log.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP/JSON API for the enrolment system.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args(argv)
+    asyncio.run(serve(args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
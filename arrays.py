@@ -0,0 +1,14 @@
+import numpy as np
+
+
+def positions(addresses, members, count):
+    # Registry positions of count objects, found by matching id() against
+    # addresses, the id() of every object in the registry list. Both sides
+    # are sorted before the search, which avoids millions of cache-missing
+    # dict lookups.
+    order = np.argsort(addresses)
+    wanted = np.fromiter(map(id, members), np.uint64, count)
+    wanted_order = np.argsort(wanted)
+    result = np.empty(count, np.int64)
+    result[wanted_order] = order[np.searchsorted(addresses[order], wanted[wanted_order])]
+    return result
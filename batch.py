@@ -0,0 +1,124 @@
+import argparse
+import csv
+import json
+import os
+import time
+
+from task_3_advisor_approval import enrol, restore_state, save_state
+
+RESULT_FIELDS = ["row", "student", "course", "status"]
+
+
+def find_student(registry, key):
+    # The student with this id, or the only student with this name.
+    matches = registry.find_students(key)
+    return matches[0] if len(matches) == 1 else None
+
+
+def find_course(registry, key):
+    matches = registry.find_courses(key)
+    return matches[0] if len(matches) == 1 else None
+
+
+class LookupFailed(Exception):
+    # shared is True when the key is a name several records have.
+    def __init__(self, message, shared=False):
+        super().__init__(message)
+        self.shared = shared
+
+
+def lookup(registry, kind, key):
+    # The student or course ("student" or "course" in kind) that key names,
+    # like find_student and find_course, but raising LookupFailed with a
+    # message for the caller to pass on instead of returning None.
+    if kind == "student":
+        matches, id_field = registry.find_students(key), "student_id"
+    else:
+        matches, id_field = registry.find_courses(key), "course_code"
+    if len(matches) == 1:
+        return matches[0]
+    if matches:
+        ids = ", ".join(getattr(match, id_field) for match in matches)
+        raise LookupFailed(f'{kind} name "{key}" is shared by {ids}; use the {id_field}', shared=True)
+    raise LookupFailed(f'{kind} "{key}" not found')
+
+
+def read_requests(file_name):
+    # Yields (row, student, course) from a CSV with student,course columns or
+    # from JSON lines of {"student": ..., "course": ...}.
+    with open(file_name, 'r', newline='') as request_file:
+        if file_name.endswith((".jsonl", ".ndjson")):
+            for row, line in enumerate(request_file, 1):
+                if line.strip():
+                    try:
+                        record = json.loads(line)
+                        yield row, str(record["student"]), str(record["course"])
+                    except (ValueError, KeyError, TypeError):
+                        yield row, None, None
+        else:
+            for row, record in enumerate(csv.DictReader(request_file), 1):
+                yield row, record.get("student") or "", record.get("course") or ""
+
+
+def open_results(file_name):
+    result_file = open(file_name, 'w', newline='')
+    if file_name.endswith((".jsonl", ".ndjson")):
+        def write(result):
+            result_file.write(json.dumps(dict(zip(RESULT_FIELDS, result))) + "\n")
+    else:
+        csv_writer = csv.writer(result_file)
+        csv_writer.writerow(RESULT_FIELDS)
+        write = csv_writer.writerow
+    return result_file, write
+
+
+def resolve_row(registry, student_key, course_key):
+    # (student, course, None), or (None, None, the status that stops the row).
+    if student_key is None:
+        return None, None, "invalid row"
+    student = find_student(registry, student_key.strip())
+    course = find_course(registry, course_key.strip())
+    if student is None:
+        return None, None, "ambiguous student" if registry.find_students(student_key.strip()) else "unknown student"
+    if course is None:
+        return None, None, "ambiguous course" if registry.find_courses(course_key.strip()) else "unknown course"
+    return student, course, None
+
+
+def run_batch(registry, requests, write_result, log=None):
+    counts = {}
+    for row, student_key, course_key in requests:
+        student, course, status = resolve_row(registry, student_key, course_key)
+        if status is None:
+            status = enrol(registry, student, course, log)
+        counts[status] = counts.get(status, 0) + 1
+        write_result((row, student_key or "", course_key or "", status))
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply a file of (student, course) enrolment requests.")
+    parser.add_argument("requests", help="CSV with student,course columns, or .jsonl")
+    parser.add_argument("-o", "--output", help="result file (default: <requests>.results.csv)")
+    args = parser.parse_args(argv)
+    output = args.output or os.path.splitext(args.requests)[0] + ".results.csv"
+
+    registry, log = restore_state(batch_size=4096, batch_interval=1.0)
+    result_file, write_result = open_results(output)
+    start = time.perf_counter()
+    try:
+        counts = run_batch(registry, read_requests(args.requests), write_result, log)
+    finally:
+        result_file.close()
+        elapsed = time.perf_counter() - start
+        save_state(registry, log)
+        log.close()
+
+    rows = sum(counts.values())
+    for status, count in sorted(counts.items()):
+        print(f"{status}: {count}")
+    print(f"Processed {rows} rows in {elapsed:.2f}s ({rows / elapsed if elapsed else 0:,.0f} rows/s). Results in {output}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import random
+import time
+from collections import Counter
+
+from allocation import allocate
+from models import MAX_COURSES
+from task_3_advisor_approval import Course, Student
+
+
+def generate(student_count, course_count, choices=6, seed=1):
+    # Course popularity follows a rough Zipf curve so the top courses are
+    # heavily oversubscribed while total demand stays near total supply.
+    generator = random.Random(seed)
+    courses = [Course(f"CS{n:05d}", f"Course {n}", generator.randint(50, 400)) for n in range(course_count)]
+    weights = [1 / (rank + 1) for rank in range(course_count)]
+    students = [Student(f"U{n:07d}", f"Student {n}", "Undergraduate") for n in range(student_count)]
+    preferences = {}
+    for student in students:
+        ranked = []
+        while len(ranked) < choices:
+            for course in generator.choices(courses, weights, k=choices):
+                if course not in ranked and len(ranked) < choices:
+                    ranked.append(course)
+        preferences[student.student_id] = ranked
+    return students, courses, preferences
+
+
+def check(allocation, courses):
+    seats = Counter(course.course_code for taken in allocation.values() for course in taken)
+    capacity = {course.course_code: course.max_capacity for course in courses}
+    assert all(seats[code] <= capacity[code] for code in seats)
+    assert all(len(taken) <= MAX_COURSES for taken in allocation.values())
+    return sum(seats.values())
+
+
+def main():
+    print(f"{'students':>9} {'courses':>8} {'seats':>9} {'first choice':>13} {'time (s)':>9}")
+    for student_count, course_count in ((10_000, 100), (100_000, 1_000)):
+        students, courses, preferences = generate(student_count, course_count)
+        start = time.perf_counter()
+        allocation = allocate(students, preferences, seed=7)
+        elapsed = time.perf_counter() - start
+        seats = check(allocation, courses)
+        assert allocation == allocate(students, preferences, seed=7)
+        first_choice = sum(1 for student_id, taken in allocation.items()
+                           if taken and taken[0] is preferences[student_id][0]) / len(allocation)
+        print(f"{student_count:>9} {course_count:>8} {seats:>9} {first_choice:>13.0%} {elapsed:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
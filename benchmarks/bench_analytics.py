@@ -0,0 +1,35 @@
+import tempfile
+import time
+
+from analytics import EnrolmentArrays, summarise
+from benchmarks.bench_snapshot import enrol_randomly, load_csvs, timed, write_csvs
+from models import MAX_ADVISEES, MAX_COURSES
+
+
+def loop_summary(registry):
+    # The same headline numbers gathered with plain loops over the model.
+    full = sum(1 for course in registry.courses if len(course.enrolled_students) >= course.max_capacity)
+    postgraduate_enrolments = sum(1 for course in registry.courses for student in course.enrolled_students
+                                  if student.student_type.lower() == "postgraduate")
+    below = sum(1 for student in registry.students if len(student.enrolled_courses) < MAX_COURSES)
+    at_cap = sum(1 for advisor in registry.advisors if len(advisor.assigned_students) >= MAX_ADVISEES)
+    return full, postgraduate_enrolments, below, at_cap
+
+
+def main():
+    print(f"{'students':>9} {'enrolments':>11} {'loops (s)':>10} {'export (s)':>11} {'numpy (s)':>10}")
+    for student_count, course_count in ((100_000, 1_000), (1_000_000, 10_000)):
+        with tempfile.TemporaryDirectory() as directory:
+            write_csvs(directory, student_count, course_count)
+            registry = load_csvs(directory)
+        enrol_randomly(registry)
+        loops, _ = timed(loop_summary, registry)
+        export, arrays = timed(EnrolmentArrays, registry)
+        start = time.perf_counter()
+        summary = summarise(arrays)
+        vectorised = time.perf_counter() - start
+        print(f"{student_count:>9} {summary['enrolled']:>11} {loops:>10.3f} {export:>11.3f} {vectorised:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_snapshot import write_csvs
+
+HOST = "127.0.0.1"
+PORT = 8765
+
+
+async def request(reader, writer, method, path, payload=None):
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: {HOST}\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    length = next(int(line.split(b":")[1]) for line in head.split(b"\r\n") if line.lower().startswith(b"content-length"))
+    return await reader.readexactly(length)
+
+
+async def client(seed, requests, student_count, course_count, latencies):
+    generator = random.Random(seed)
+    reader, writer = await asyncio.open_connection(HOST, PORT)
+    try:
+        for _ in range(requests):
+            course = f"CS{generator.randrange(course_count):05d}"
+            start = time.perf_counter()
+            if generator.random() < 0.5:
+                student = f"U{generator.randrange(1, student_count):07d}"
+                await request(reader, writer, "POST", "/enrol", {"student": student, "course": course})
+            else:
+                await request(reader, writer, "GET", f"/courses/{course}/roster")
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def load(clients, requests, student_count, course_count):
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(n, requests, student_count, course_count, latencies) for n in range(clients)))
+    return time.perf_counter() - start, sorted(latencies)
+
+
+def wait_for_server(process):
+    line = process.stdout.readline()
+    if not line.startswith("Serving"):
+        raise RuntimeError(f"server failed to start: {line}{process.stdout.read()}")
+
+
+def main():
+    student_count, course_count = 100_000, 1_000
+    repository = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with tempfile.TemporaryDirectory() as directory:
+        write_csvs(directory, student_count, course_count)
+        process = subprocess.Popen([sys.executable, os.path.join(repository, "api_server.py"), "--port", str(PORT)],
+                                   cwd=directory, stdout=subprocess.PIPE, text=True)
+        try:
+            wait_for_server(process)
+            print(f"{'clients':>8} {'requests':>9} {'req/s':>9} {'p50 (ms)':>9} {'p99 (ms)':>9}")
+            for clients in (10, 100, 1_000, 2_000):
+                requests = max(20_000 // clients, 5)
+                elapsed, latencies = asyncio.run(load(clients, requests, student_count, course_count))
+                p50 = latencies[len(latencies) // 2] * 1000
+                p99 = latencies[int(len(latencies) * 0.99)] * 1000
+                print(f"{clients:>8} {len(latencies):>9} {len(latencies) / elapsed:>9,.0f} {p50:>9.2f} {p99:>9.2f}")
+        finally:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import csv
+import os
+import tempfile
+import time
+
+from task_3_advisor_approval import Advisor, Student, load_advisors
+
+
+def load_advisors_linear(file_name, students):
+    # The original nested-loop loader, kept here as the baseline.
+    advisors = []
+    with open(file_name, 'r') as advisor_file:
+        csv_reader = csv.reader(advisor_file)
+        next(csv_reader)
+        for row in csv_reader:
+            advisor = Advisor(row[0])
+            for student_id in row[1:]:
+                for student in students:
+                    if student.student_id == student_id:
+                        advisor.add_assigned_student(student)
+            advisors.append(advisor)
+    return advisors
+
+
+def write_advisors(file_name, student_count):
+    with open(file_name, 'w', newline='') as advisor_file:
+        csv_writer = csv.writer(advisor_file)
+        csv_writer.writerow(["advisor_name", "student_ids"])
+        for first in range(0, student_count, 3):
+            ids = [f"P{n:07d}" for n in range(first, min(first + 3, student_count))]
+            csv_writer.writerow([f"Dr. Advisor {first // 3}"] + ids)
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        file_name = os.path.join(directory, "advisors.csv")
+        print(f"{'students':>10} {'linear (s)':>12} {'indexed (s)':>12} {'speedup':>10}")
+        for student_count in (250, 1_000, 4_000):
+            students = [Student(f"P{n:07d}", f"Student {n}", "Postgraduate") for n in range(student_count)]
+            write_advisors(file_name, student_count)
+            linear_time, linear = timed(load_advisors_linear, file_name, students)
+            indexed_time, indexed = timed(load_advisors, file_name, students)
+            assert [a.assigned_students for a in linear] == [a.assigned_students for a in indexed]
+            print(f"{student_count:>10} {linear_time:>12.4f} {indexed_time:>12.4f} {linear_time / indexed_time:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
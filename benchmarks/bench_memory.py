@@ -0,0 +1,71 @@
+import gc
+import tracemalloc
+
+from models import Course, Student
+
+
+class DictStudent:
+    # The original __dict__-backed classes, kept here as the baseline.
+    def __init__(self, student_id, name, student_type):
+        self.__student_id = student_id
+        self.__student_name = name
+        self.__student_type = student_type
+        self.__enrolled_courses = []
+
+    def add_course(self, course_name):
+        self.__enrolled_courses.append(course_name)
+
+
+class DictCourse:
+    def __init__(self, course_code, name, max_capacity):
+        self.__course_code = course_code
+        self.__course_name = name
+        self.__max_capacity = int(max_capacity)
+        self.__enrolled_students = []
+
+    def add_student(self, student):
+        # The original also scanned the list for duplicates; only the memory matters here.
+        self.__enrolled_students.append(student)
+        return True
+
+
+def build(student_class, course_class, student_count, course_count, enrolments):
+    # Prefixes are concatenated at run time so each row gets its own string,
+    # as it would when read from a CSV file. Every student then takes
+    # enrolments courses, which fills both the rosters and the schedules.
+    students = [student_class(f"P{n:07d}", f"Student {n}", ("Post", "Under")[n % 2] + "graduate")
+                for n in range(student_count)]
+    capacity = str(student_count * enrolments // course_count + 1)
+    courses = [course_class(f"CS{n:05d}", f"Course {n}", capacity) for n in range(course_count)]
+    names = [f"Course {n}" for n in range(course_count)]
+    for n, student in enumerate(students):
+        for taken in range(enrolments):
+            course = (n + taken * 7) % course_count
+            courses[course].add_student(student)
+            student.add_course(names[course])
+    return students, courses
+
+
+def measure(student_class, course_class, student_count, course_count, enrolments):
+    gc.collect()
+    tracemalloc.start()
+    data = build(student_class, course_class, student_count, course_count, enrolments)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del data
+    return current
+
+
+def main():
+    print(f"{'students':>10} {'courses each':>13} {'dict (MB)':>10} {'slots (MB)':>11} {'saved':>7}")
+    for student_count in (10_000, 100_000, 1_000_000):
+        course_count = max(student_count // 100, 1)
+        for enrolments in (0, 2, 4):
+            before = measure(DictStudent, DictCourse, student_count, course_count, enrolments)
+            after = measure(Student, Course, student_count, course_count, enrolments)
+            print(f"{student_count:>10} {enrolments:>13} {before / 2**20:>10.1f} {after / 2**20:>11.1f} "
+                  f"{1 - after / before:>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.bench_snapshot import load_csvs, write_csvs
+from oplog import OpLog, recover
+
+
+def append_throughput(file_name, records, batch_size):
+    log = OpLog(file_name, batch_size=batch_size, batch_interval=1.0)
+    start = time.perf_counter()
+    for n in range(records):
+        log.append("enrol", f"CS{n % 1000:05d}", f"U{n:07d}")
+    log.close()
+    return records / (time.perf_counter() - start)
+
+
+def write_workload(file_name, registry, records, seed=1):
+    generator = random.Random(seed)
+    log = OpLog(file_name, batch_size=1024)
+    enrolled = []
+    for _ in range(records):
+        if enrolled and generator.random() < 0.3:
+            course_code, student_id = enrolled.pop(generator.randrange(len(enrolled)))
+            log.append("drop", course_code, student_id)
+        else:
+            course = generator.choice(registry.courses)
+            student = generator.choice(registry.students)
+            enrolled.append((course.course_code, student.student_id))
+            log.append("enrol", course.course_code, student.student_id)
+    log.close()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        file_name = os.path.join(directory, "enrolment.log")
+        print(f"{'batch size':>10} {'appends/s':>12}")
+        for batch_size in (1, 16, 256, 4096):
+            records = 2_000 if batch_size == 1 else 100_000
+            print(f"{batch_size:>10} {append_throughput(file_name, records, batch_size):>12,.0f}")
+            os.remove(file_name)
+
+        write_csvs(directory, 100_000, 1_000)
+        print(f"\n{'records':>10} {'recovery (s)':>13} {'records/s':>12}")
+        for records in (10_000, 100_000, 1_000_000):
+            registry = load_csvs(directory)
+            write_workload(file_name, registry, records)
+            start = time.perf_counter()
+            recover(file_name, registry)
+            elapsed = time.perf_counter() - start
+            print(f"{records:>10} {elapsed:>13.3f} {records / elapsed:>12,.0f}")
+            os.remove(file_name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import io
+import random
+import tempfile
+
+from benchmarks.bench_snapshot import enrol_randomly, load_csvs, timed, write_csvs
+from report import HEADERS, render_grid, render_plain, ReportCache
+
+
+def uncached_grid(courses, out):
+    # The report as list_all_courses built it before the cache.
+    from tabulate import tabulate
+    table = []
+    for course in courses:
+        names = ", ".join([student.student_name for student in course.enrolled_students]) or "None"
+        table.append([course.course_code, course.course_name, course.max_capacity, len(course.enrolled_students), names])
+    out.write(tabulate(table, headers=HEADERS, tablefmt="grid"))
+
+
+def churn(registry, changes, seed=2):
+    generator = random.Random(seed)
+    for _ in range(changes):
+        student = generator.choice(registry.students)
+        course = generator.choice(registry.courses)
+        if course.drop_student(student):
+            student.drop_course(course.course_name)
+        elif course.add_student(student):
+            student.add_course(course.course_name)
+
+
+def main():
+    print(f"{'courses':>8} {'students':>9} {'uncached (s)':>13} {'first grid (s)':>15} {'grid after 10 (s)':>18} "
+          f"{'plain after 10 (s)':>19}")
+    for student_count, course_count in ((10_000, 100), (100_000, 1_000), (300_000, 3_000)):
+        with tempfile.TemporaryDirectory() as directory:
+            write_csvs(directory, student_count, course_count)
+            registry = load_csvs(directory)
+        enrol_randomly(registry)
+        uncached, _ = timed(uncached_grid, registry.courses, io.StringIO())
+        cache = ReportCache()
+        first, _ = timed(render_grid, cache.rows(registry.courses), io.StringIO())
+        churn(registry, 10)
+        grid, _ = timed(render_grid, cache.rows(registry.courses), io.StringIO())
+        churn(registry, 10, seed=3)
+        plain, _ = timed(render_plain, cache.rows(registry.courses), io.StringIO())
+        print(f"{course_count:>8} {student_count:>9} {uncached:>13.3f} {first:>15.3f} {grid:>18.3f} {plain:>19.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import io
+import time
+
+from registry import fold
+from task_3_advisor_approval import Course, Student
+
+
+def lecture(size):
+    course = Course("CS100", "Big Lecture", size)
+    for n in range(size):
+        kind = "Postgraduate" if n % 4 == 0 else "Undergraduate"
+        course.add_student(Student(f"{kind[0]}{n:07d}", f"Student {(n * 7919) % size}", kind))
+    return course
+
+
+def sorted_pages(course, page_size):
+    # Sorting and slicing the roster again for every page.
+    out = io.StringIO()
+    for start in range(0, len(course.enrolled_students), page_size):
+        students = sorted(course.enrolled_students, key=lambda student: (fold(student.student_name), student.student_id))
+        out.write("".join(f"  {student}\n" for student in students[start:start + page_size]))
+
+
+def indexed_pages(course, page_size):
+    out = io.StringIO()
+    cursor = None
+    while True:
+        students, cursor = course.roster.page("name", None, cursor, page_size)
+        out.write("".join(f"  {student}\n" for student in students))
+        if cursor is None:
+            break
+
+
+def main():
+    print(f"{'students':>9} {'page':>5} {'sort per page (ms)':>19} {'indexed (ms)':>13} {'indexed again (ms)':>19}")
+    for size in (5_000, 20_000):
+        for page_size in (50, 500):
+            course = lecture(size)
+            timings = []
+            for function in (sorted_pages, indexed_pages, indexed_pages):
+                start = time.perf_counter()
+                function(course, page_size)
+                timings.append((time.perf_counter() - start) * 1000)
+            print(f"{size:>9} {page_size:>5} {timings[0]:>19.1f} {timings[1]:>13.1f} {timings[2]:>19.1f}")
+
+
+if __name__ == "__main__":
+    main()
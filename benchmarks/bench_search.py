@@ -0,0 +1,57 @@
+import random
+import time
+
+from registry import Registry
+from task_3_advisor_approval import Student
+
+SYLLABLES = ["an", "bel", "car", "da", "el", "fin", "gar", "ha", "is", "jo", "ka", "lin", "mar", "no", "or", "pe",
+             "qui", "ros", "sa", "ton", "ul", "vi", "wen", "xa", "yo", "zed"]
+
+
+def pseudo_word(generator):
+    return "".join(generator.choice(SYLLABLES) for _ in range(generator.randint(2, 3))).capitalize()
+
+
+def population(count, seed=1):
+    generator = random.Random(seed)
+    first_names = [pseudo_word(generator) for _ in range(2_000)]
+    last_names = [pseudo_word(generator) for _ in range(20_000)]
+    return [Student(f"{'P' if n % 4 == 0 else 'U'}{n:07d}",
+                    f"{generator.choice(first_names)} {generator.choice(last_names)}",
+                    "Postgraduate" if n % 4 == 0 else "Undergraduate") for n in range(count)]
+
+
+def typo(word, generator):
+    n = generator.randrange(1, len(word) - 1)
+    return word[:n] + word[n + 1] + word[n] + word[n + 2:]
+
+
+def main():
+    generator = random.Random(2)
+    print(f"{'students':>9} {'build (s)':>10} {'query':>14} {'median (ms)':>12} {'p99 (ms)':>9}")
+    for count in (100_000, 1_000_000):
+        students = population(count)
+        registry = Registry(students)
+        start = time.perf_counter()
+        registry.search_students("warm up")
+        build = time.perf_counter() - start
+        samples = generator.sample(students, 200)
+        queries = {
+            "full name": [student.student_name for student in samples],
+            "name prefix": [student.student_name[:len(student.student_name) - 2] for student in samples],
+            "last name typo": [typo(student.student_name.split()[1], generator) for student in samples],
+            "id prefix": [student.student_id[:6] for student in samples],
+        }
+        for label, texts in queries.items():
+            timings = []
+            for text in texts:
+                start = time.perf_counter()
+                registry.search_students(text)
+                timings.append((time.perf_counter() - start) * 1000)
+            timings.sort()
+            print(f"{count:>9} {build:>10.2f} {label:>14} {timings[len(timings) // 2]:>12.3f} "
+                  f"{timings[int(len(timings) * 0.99)]:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import argparse
+import os
+import random
+import resource
+import tempfile
+import time
+from collections import Counter
+
+from benchmarks.bench_allocation import generate
+from benchmarks.stress_concurrent import check_invariants
+from oplog import OpLog
+from registry import Registry
+from sharded import ShardedEnrolment
+from task_3_advisor_approval import enrol
+
+
+def workload(student_count, course_count, request_count, seed=3):
+    students, courses, _ = generate(student_count, course_count, choices=1)
+    generator = random.Random(seed)
+    pairs = [(generator.randrange(student_count), generator.randrange(course_count)) for _ in range(request_count)]
+    registry = Registry(students, courses)
+    return registry, [(registry.students[student], registry.courses[course]) for student, course in pairs]
+
+
+def children_cpu():
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def run_sequential(registry, requests, log):
+    cpu, start = time.process_time(), time.perf_counter()
+    results = [enrol(registry, student, course, log) for student, course in requests]
+    return results, time.perf_counter() - start, time.process_time() - cpu, 0.0, 0.0
+
+
+def run_sharded(registry, requests, workers, log):
+    # The rate covers enrol_many, which starts the workers, and close(),
+    # which copies their seats back on the coordinator.
+    child_cpu, cpu, start = children_cpu(), time.process_time(), time.perf_counter()
+    sharded = ShardedEnrolment(registry, workers, log)
+    results = sharded.enrol_many(requests)
+    finish = time.perf_counter()
+    sharded.close()
+    finish = time.perf_counter() - finish
+    elapsed, cpu = time.perf_counter() - start, time.process_time() - cpu
+    return results, elapsed, cpu, children_cpu() - child_cpu, finish
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sharded enrolment against one process, on a generated rush.")
+    parser.add_argument("--students", type=int, default=100_000)
+    parser.add_argument("--courses", type=int, default=1_000)
+    parser.add_argument("--requests", type=int, default=300_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=(1, 2, 4, 8))
+    args = parser.parse_args(argv)
+    print(f"{os.cpu_count()} CPUs. The coordinator's share of the CPU time does not spread over workers; "
+          f"1 / share bounds the speed-up on enough cores. ops/s includes starting the workers and "
+          f"close().")
+    print(f"{'mode':>12} {'log':>4} {'ops/s':>10} {'enrolled':>9} {'waitlisted':>11} {'limit':>7} {'as one process':>15} "
+          f"{'coord CPU (s)':>14} {'worker CPU (s)':>15} {'coord share':>12} {'close (s)':>10}")
+    for logged in (False, True):
+        expected = None
+        for workers in (0, *args.workers):
+            registry, requests = workload(args.students, args.courses, args.requests)
+            with tempfile.TemporaryDirectory() as directory:
+                log = OpLog(os.path.join(directory, "enrolment.log"), batch_size=4096, batch_interval=1.0) if logged else None
+                if workers:
+                    run = run_sharded(registry, requests, workers, log)
+                else:
+                    run = run_sequential(registry, requests, log)
+                results, elapsed, cpu, child_cpu, finish = run
+                if log is not None:
+                    log.close()
+            check_invariants(registry)
+            expected = expected or results
+            counts = Counter(results)
+            mode = f"{workers} workers" if workers else "one process"
+            same = "yes" if results == expected else "NO"
+            print(f"{mode:>12} {'on' if logged else 'off':>4} {len(requests) / elapsed:>10,.0f} {counts['enrolled']:>9} "
+                  f"{counts['waitlisted']:>11} {counts['course limit']:>7} {same:>15} {cpu:>14.2f} {child_cpu:>15.2f} "
+                  f"{cpu / (cpu + child_cpu):>12.0%} {finish:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
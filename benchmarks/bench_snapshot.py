@@ -0,0 +1,75 @@
+import csv
+import os
+import random
+import tempfile
+import time
+
+from snapshot import Snapshot, save_snapshot
+from task_3_advisor_approval import load_advisors, load_courses, load_snapshot, load_students
+from registry import Registry
+
+
+def write_csvs(directory, student_count, course_count):
+    with open(os.path.join(directory, "students.csv"), 'w', newline='') as student_file:
+        csv_writer = csv.writer(student_file)
+        csv_writer.writerow(["student_id", "name", "student_type"])
+        for n in range(student_count):
+            kind = "Postgraduate" if n % 4 == 0 else "Undergraduate"
+            csv_writer.writerow([f"{kind[0]}{n:07d}", f"Student {n}", kind])
+    with open(os.path.join(directory, "courses.csv"), 'w', newline='') as course_file:
+        csv_writer = csv.writer(course_file)
+        csv_writer.writerow(["course_code", "course_name", "max_capacity"])
+        for n in range(course_count):
+            csv_writer.writerow([f"CS{n:05d}", f"Course {n}", 400])
+    with open(os.path.join(directory, "advisors.csv"), 'w', newline='') as advisor_file:
+        csv_writer = csv.writer(advisor_file)
+        csv_writer.writerow(["advisor_name", "student_ids"])
+        for first in range(0, student_count, 12):
+            csv_writer.writerow([f"Dr. Advisor {first}"] + [f"P{n:07d}" for n in range(first, min(first + 12, student_count), 4)])
+
+
+def load_csvs(directory):
+    students = load_students(os.path.join(directory, "students.csv"))
+    courses = load_courses(os.path.join(directory, "courses.csv"))
+    advisors = load_advisors(os.path.join(directory, "advisors.csv"), students)
+    return Registry(students, courses, advisors)
+
+
+def enrol_randomly(registry, seed=1):
+    generator = random.Random(seed)
+    for student in registry.students:
+        for course in generator.sample(registry.courses, 3):
+            if course.add_student(student):
+                student.add_course(course.course_name)
+
+
+def decode(file_name):
+    with Snapshot(file_name) as snapshot:
+        return snapshot.students(), snapshot.courses(), snapshot.rosters(), snapshot.schedules()
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    # The CSV path starts with empty rosters; the snapshot also restores three enrolments per student.
+    print(f"{'students':>10} {'csv (s)':>9} {'decode (s)':>11} {'restore (s)':>12} {'size (MB)':>10}")
+    for student_count in (10_000, 100_000, 500_000):
+        with tempfile.TemporaryDirectory() as directory:
+            write_csvs(directory, student_count, max(student_count // 100, 10))
+            csv_time, registry = timed(load_csvs, directory)
+            enrol_randomly(registry)
+            snapshot_file = os.path.join(directory, "enrolment.snapshot")
+            save_snapshot(snapshot_file, registry)
+            decode_time, _ = timed(decode, snapshot_file)
+            restore_time, (restored, _) = timed(load_snapshot, snapshot_file)
+            assert [len(c.enrolled_students) for c in restored.courses] == [len(c.enrolled_students) for c in registry.courses]
+            size = os.path.getsize(snapshot_file) / 2**20
+            print(f"{student_count:>10} {csv_time:>9.3f} {decode_time:>11.3f} {restore_time:>12.3f} {size:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+ENTRY_POINTS = ("enrolment", "task_3_advisor_approval", "Problem_1", "problem_2", "batch", "api_server")
+
+
+def import_times(module):
+    # python -X importtime reports every import on stderr as
+    # "import time: self | cumulative | name", in microseconds, nested
+    # imports indented under the module that pulled them in.
+    start = time.perf_counter()
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            check=True, capture_output=True, text=True).stderr
+    wall = time.perf_counter() - start
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "self [us]" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return wall, times
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold-start cost of each entry point, from python -X importtime.")
+    parser.add_argument("modules", nargs="*", default=ENTRY_POINTS)
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--top", type=int, default=5, help="heaviest imports to list per entry point")
+    args = parser.parse_args(argv)
+
+    print(f"{'entry point':>24} {'import (ms)':>12} {'process (ms)':>13}  heaviest imports (ms)")
+    for module in args.modules:
+        runs = [import_times(module) for _ in range(args.runs)]
+        own = statistics.median(times[module] for _, times in runs) / 1000
+        wall = statistics.median(wall for wall, _ in runs) * 1000
+        last = runs[-1][1]
+        heaviest = sorted((name for name in last if name != module), key=lambda name: -last[name])[:args.top]
+        print(f"{module:>24} {own:>12.1f} {wall:>13.1f}  " +
+              ", ".join(f"{name} {last[name] / 1000:.1f}" for name in heaviest))
+
+
+if __name__ == "__main__":
+    main()
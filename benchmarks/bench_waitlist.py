@@ -0,0 +1,42 @@
+import random
+import time
+
+from task_3_advisor_approval import Course, Student, drop, enrol
+from registry import Registry
+
+
+def churn(waitlist_size, operations, seed=1):
+    # One full course with a long waitlist. Every operation drops a random
+    # enrolled student, which promotes the head of the waitlist, and the
+    # dropped student re-enrols at the back of the queue.
+    generator = random.Random(seed)
+    capacity = 500
+    course = Course("CS00001", "Popular Course", capacity)
+    students = [Student(f"U{n:07d}", f"Student {n}", "Undergraduate") for n in range(capacity + waitlist_size)]
+    registry = Registry(students, [course])
+    for student in students:
+        enrol(registry, student, course)
+    assert len(course.waitlist) == waitlist_size
+
+    roster = list(course.enrolled_students)
+    start = time.perf_counter()
+    for _ in range(operations):
+        seat = generator.randrange(capacity)
+        student = roster[seat]
+        drop(student, course)
+        roster[seat] = next(reversed(course.enrolled_students))
+        enrol(registry, student, course)
+    elapsed = time.perf_counter() - start
+    assert len(course.enrolled_students) == capacity and len(course.waitlist) == waitlist_size
+    return operations / elapsed
+
+
+def main():
+    print(f"{'waitlist':>9} {'drop+promote/s':>15}")
+    for waitlist_size in (1_000, 10_000, 100_000, 1_000_000):
+        operations = 200_000
+        print(f"{waitlist_size:>9} {churn(waitlist_size, operations):>15,.0f}")
+
+
+if __name__ == "__main__":
+    main()
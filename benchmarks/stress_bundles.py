@@ -0,0 +1,71 @@
+import random
+import sys
+import threading
+import time
+
+from benchmarks.stress_concurrent import check_invariants, decide, institution
+from concurrent_enrolment import EnrolmentService
+
+
+def worker(service, students, seed, operations, counts):
+    # Each thread owns its students, so after every call it can check that
+    # the bundle landed whole or not at all. Postgraduates cannot bundle;
+    # their single-course requests and the advisor decisions run alongside.
+    generator = random.Random(seed)
+    courses = service.registry.courses
+    requested = []
+    for _ in range(operations):
+        student = generator.choice(students)
+        bundle = generator.sample(courses, 2)
+        action = generator.random()
+        if action < 0.3 and student.enrolled_courses:
+            course_name = next(iter(student.enrolled_courses))
+            status = service.drop(student, service.registry.get_course(course_name))
+        elif action < 0.45 and student.student_type == "Postgraduate":
+            status = service.enrol(student, bundle[0])
+            if status == "requested":
+                requested.append((student, bundle[0]))
+        elif action < 0.55 and requested:
+            status = decide(service, generator, requested)
+        else:
+            before = set(student.enrolled_courses)
+            status, _ = service.enrol_bundle(student, bundle)
+            taken = {course.course_name for course in bundle}
+            if status == "enrolled":
+                assert taken <= set(student.enrolled_courses), "bundle only partly enrolled"
+            else:
+                assert set(student.enrolled_courses) == before, f"{status} bundle changed {student}"
+        counts[status] = counts.get(status, 0) + 1
+
+
+def main():
+    sys.setswitchinterval(1e-6)
+    operations = 200_000
+    print(f"{'threads':>8} {'ops/s':>10} {'bundles':>8} {'full':>7} {'limit':>7} {'refused':>8} {'requested':>10} "
+          f"{'approved':>9}")
+    for thread_count in (1, 4, 16, 64):
+        service = EnrolmentService(institution(20_000, 500, 100))
+        students = service.registry.students
+        counts = [{} for _ in range(thread_count)]
+        threads = [threading.Thread(target=worker, args=(service, students[n::thread_count], n,
+                                                         operations // thread_count, counts[n]))
+                   for n in range(thread_count)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        check_invariants(service.registry)
+        totals = {}
+        for count in counts:
+            for status, number in count.items():
+                totals[status] = totals.get(status, 0) + number
+        print(f"{thread_count:>8} {operations / elapsed:>10,.0f} {totals.get('enrolled', 0):>8} "
+              f"{totals.get('course full', 0):>7} {totals.get('course limit', 0):>7} {totals.get('needs approval', 0):>8} "
+              f"{totals.get('requested', 0):>10} {totals.get('approved', 0):>9}")
+    print("Invariants held: every bundle enrolled whole or not at all.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import random
+import sys
+import threading
+import time
+
+from benchmarks.bench_allocation import generate
+from concurrent_enrolment import EnrolmentService
+from models import MAX_COURSES, Advisor, Course, Student
+from registry import Registry
+
+
+def institution(student_count, course_count, capacity, postgraduate_share=0.25):
+    # generate() makes undergraduates only. Here a share of them become
+    # postgraduates, three to an advisor, so requests, approvals and denials
+    # take the student -> course -> advisor locks too.
+    students, courses, _ = generate(student_count, course_count, choices=1)
+    students = [Student(student.student_id, student.student_name,
+                        "Postgraduate" if n % round(1 / postgraduate_share) == 0 else "Undergraduate")
+                for n, student in enumerate(students)]
+    courses = [Course(course.course_code, course.course_name, capacity) for course in courses]
+    postgraduates = [student for student in students if student.student_type == "Postgraduate"]
+    advisors = []
+    for first in range(0, len(postgraduates), 3):
+        advisor = Advisor(f"Dr. Advisor {first // 3}")
+        for student in postgraduates[first:first + 3]:
+            advisor.add_assigned_student(student)
+        advisors.append(advisor)
+    return Registry(students, courses, advisors)
+
+
+def decide(service, generator, requested):
+    # Approves or denies one of the requests this thread has filed. Many
+    # will already have been settled, which must be answered "not pending".
+    student, course = requested.pop(generator.randrange(len(requested)))
+    advisor = service.registry.get_advisor(student)
+    if generator.random() < 0.7:
+        return service.approve(advisor, student, course)
+    return service.deny(advisor, student, course)
+
+
+def worker(service, seed, operations, counts):
+    generator = random.Random(seed)
+    students = service.registry.students
+    courses = service.registry.courses
+    requested = []
+    for _ in range(operations):
+        student = generator.choice(students)
+        course = generator.choice(courses)
+        action = generator.random()
+        if action < 0.15 and requested:
+            status = decide(service, generator, requested)
+        elif action < 0.4:
+            status = service.drop(student, course)
+        else:
+            status = service.enrol(student, course)
+            if status == "requested":
+                requested.append((student, course))
+        counts[status] = counts.get(status, 0) + 1
+
+
+def check_invariants(registry):
+    for course in registry.courses:
+        assert len(course.enrolled_students) <= course.max_capacity, f"{course} overbooked"
+        assert not any(student in course.waitlist for student in course.enrolled_students), f"{course} waitlist stale"
+        for student in course.enrolled_students:
+            assert course.course_name in student.enrolled_courses, f"{student} missing {course.course_name}"
+    for student in registry.students:
+        assert len(student.enrolled_courses) <= MAX_COURSES, f"{student} has {len(student.enrolled_courses)} courses"
+        for course_name in student.enrolled_courses:
+            assert student in registry.get_course(course_name).enrolled_students
+    for advisor in registry.advisors:
+        for student, course in advisor.pending_requests:
+            assert student in advisor.assigned_students, f"{advisor} holds a request from {student}"
+            assert course.course_name not in student.enrolled_courses, f"{student} enrolled with a pending request"
+            assert student not in course.waitlist, f"{student} waitlisted with a pending request"
+
+
+def main():
+    # A tiny switch interval forces far more thread interleavings than normal.
+    sys.setswitchinterval(1e-6)
+    operations = 400_000
+    print(f"{'threads':>8} {'ops/s':>10} {'enrolled':>9} {'waitlisted':>11} {'limit':>7} {'requested':>10} "
+          f"{'approved':>9} {'denied':>7}")
+    for thread_count in (1, 4, 16, 64):
+        # Small capacities keep most courses at the limit throughout the run.
+        service = EnrolmentService(institution(20_000, 200, 100))
+        counts = [{} for _ in range(thread_count)]
+        threads = [threading.Thread(target=worker, args=(service, n, operations // thread_count, counts[n]))
+                   for n in range(thread_count)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        check_invariants(service.registry)
+        totals = {}
+        for count in counts:
+            for status, number in count.items():
+                totals[status] = totals.get(status, 0) + number
+        print(f"{thread_count:>8} {operations / elapsed:>10,.0f} {totals.get('enrolled', 0):>9} "
+              f"{totals.get('waitlisted', 0):>11} {totals.get('course limit', 0):>7} {totals.get('requested', 0):>10} "
+              f"{totals.get('approved', 0):>9} {totals.get('denied', 0):>7}")
+    print(f"Invariants held: no course over max_capacity, no student over {MAX_COURSES} courses, rosters consistent, "
+          "no request left for a course its student has or waits for.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+import argparse
+import builtins
+import contextlib
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from registry import Registry
+from report import ReportCache
+from synthetic import write_institution
+from task_3_advisor_approval import (advisor_menu, enrol_student, list_all_courses, load_advisors, load_courses,
+                                     load_students)
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+ENROLMENTS = 2_000
+ADVISOR_SESSIONS = 100
+# A timing is flagged when it is this much slower than the baseline and the
+# difference is large enough not to be noise. Peak memory has its own ratio.
+TIME_RATIO = 1.5
+TIME_SLACK = 0.005
+MEMORY_RATIO = 1.2
+
+
+@contextlib.contextmanager
+def scripted(answers):
+    # Feeds the console prompts from a list and throws their output away.
+    answers = iter(answers)
+    original = builtins.input
+    builtins.input = lambda prompt="": next(answers)
+    try:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            yield
+    finally:
+        builtins.input = original
+
+
+def timed(results, name, function, *args):
+    start = time.perf_counter()
+    value = function(*args)
+    results[name] = time.perf_counter() - start
+    return value
+
+
+def measure(directory, seed=0):
+    # Runs in a fresh process per size so peak memory belongs to that size.
+    results = {}
+    students = timed(results, "load_students", load_students, os.path.join(directory, "students.csv"))
+    courses = timed(results, "load_courses", load_courses, os.path.join(directory, "courses.csv"))
+    advisors = timed(results, "load_advisors", load_advisors, os.path.join(directory, "advisors.csv"), students)
+    registry = timed(results, "build_registry", Registry, students, courses, advisors)
+    generator = random.Random(seed)
+
+    cache = ReportCache()
+    with scripted([]):
+        timed(results, "list_all_courses", list_all_courses, registry.courses, cache)
+
+    undergraduates = [student for student in students if student.student_type == "Undergraduate"]
+    answers = []
+    for _ in range(ENROLMENTS):
+        answers += [generator.choice(courses).course_code, generator.choice(undergraduates).student_id]
+    with scripted(answers):
+        start = time.perf_counter()
+        for _ in range(ENROLMENTS):
+            enrol_student(registry)
+        results["enrol_student"] = (time.perf_counter() - start) / ENROLMENTS
+
+    sessions = generator.sample(advisors, min(ADVISOR_SESSIONS, len(advisors)))
+    answers = [answer for advisor in sessions for student in advisor.assigned_students
+               for answer in (generator.choice(courses).course_code, student.student_id)]
+    with scripted(answers):
+        for advisor in sessions:
+            for _ in advisor.assigned_students:
+                enrol_student(registry)
+    with scripted([answer for advisor in sessions for answer in (advisor.advisor_name, "a", "all")]):
+        start = time.perf_counter()
+        for _ in sessions:
+            advisor_menu(registry)
+        results["advisor_menu"] = (time.perf_counter() - start) / max(len(sessions), 1)
+
+    with scripted([]):
+        timed(results, "list_all_courses_after_changes", list_all_courses, registry.courses, cache)
+    results["peak_memory_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return results
+
+
+def run_size(size, seed):
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        write_institution(directory, size, seed)
+        generate = time.perf_counter() - start
+        output = subprocess.run([sys.executable, "-m", "benchmarks.suite", "--measure", directory, "--seed", str(seed)],
+                                check=True, capture_output=True, text=True).stdout
+    results = json.loads(output.splitlines()[-1])
+    results["generate"] = generate
+    return results
+
+
+def regressions(results, baseline):
+    flagged = []
+    for size, metrics in results.items():
+        for metric, value in metrics.items():
+            before = baseline.get(size, {}).get(metric)
+            if before is None:
+                continue
+            if metric == "peak_memory_mb":
+                if value > before * MEMORY_RATIO:
+                    flagged.append((size, metric, before, value))
+            elif value > before * TIME_RATIO and value - before > TIME_SLACK:
+                flagged.append((size, metric, before, value))
+    return flagged
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the console operations on synthetic institutions.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="student counts (up to 10^7)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--measure", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.measure:
+        print(json.dumps(measure(args.measure, args.seed)))
+        return
+
+    results = {}
+    for size in args.sizes:
+        results[str(size)] = run_size(size, args.seed)
+    metrics = list(next(iter(results.values())))
+    print(f"{'metric':>32}" + "".join(f"{size:>12}" for size in results))
+    for metric in metrics:
+        if metric == "peak_memory_mb":
+            print(f"{metric:>32}" + "".join(f"{results[size][metric]:>12.1f}" for size in results))
+        else:
+            print(f"{metric + ' (ms)':>32}" + "".join(f"{results[size][metric] * 1000:>12.3f}" for size in results))
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+    if args.update_baseline:
+        baseline.update(results)
+        with open(args.baseline, 'w') as baseline_file:
+            json.dump(baseline, baseline_file, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}.")
+        return
+    flagged = regressions(results, baseline)
+    for size, metric, before, value in flagged:
+        print(f"REGRESSION: {metric} at {size} students: {value:.6g} (baseline {before:.6g})")
+    if not flagged:
+        print("No regressions against the baseline." if baseline else "No baseline yet; run with --update-baseline.")
+    sys.exit(1 if flagged else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+import argparse
+import json
+import shlex
+import sys
+
+from batch import LookupFailed, lookup
+from oplog import COMPACT_EVERY
+from report import course_json, student_json
+from roster import SORTS
+from task_3_advisor_approval import (approve_many, deny_many, drop, enrol, enrol_bundle, restore_state,
+                                     save_state)
+
+
+class CommandError(Exception):
+    pass
+
+
+class CommandParser(argparse.ArgumentParser):
+    # Raises instead of exiting, so a bad line in a pipeline becomes an
+    # error result and the lines after it still run.
+    def error(self, message):
+        raise CommandError(message)
+
+
+def advisor_of(registry, name):
+    matches = registry.find_advisors(name)
+    if len(matches) != 1:
+        raise CommandError(f'advisor "{name}" is not unique' if matches else f'advisor "{name}" not found')
+    return matches[0]
+
+
+def run_enrol(registry, args, log):
+    # Several --course options enrol the student in all of them or none.
+    student = lookup(registry, "student", args.student)
+    courses = [lookup(registry, "course", key) for key in args.course]
+    if len(courses) == 1:
+        return {"student_id": student.student_id, "course_code": courses[0].course_code,
+                "status": enrol(registry, student, courses[0], log)}
+    status, course = enrol_bundle(registry, student, courses, log)
+    return {"student_id": student.student_id, "course_codes": [course.course_code for course in courses],
+            "status": status, "course": course.course_code if course else None}
+
+
+def run_drop(registry, args, log):
+    student = lookup(registry, "student", args.student)
+    course = lookup(registry, "course", args.course)
+    return {"student_id": student.student_id, "course_code": course.course_code, "status": drop(student, course, log)}
+
+
+def run_requests(registry, args, log):
+    advisor = advisor_of(registry, args.advisor)
+    return {"advisor": advisor.advisor_name,
+            "requests": [{"request_id": request_id, "student": student_json(student), "course_code": course.course_code}
+                         for request_id, student, course in advisor.pending_requests.items()]}
+
+
+def run_decision(registry, args, log):
+    # Requests are named by id, by --all, or by --student and --course.
+    advisor = advisor_of(registry, args.advisor)
+    if args.all:
+        request_ids = [request_id for request_id, _, _ in advisor.pending_requests.items()]
+    elif args.request:
+        request_ids = args.request
+    elif args.student and args.course:
+        student, course = lookup(registry, "student", args.student), lookup(registry, "course", args.course)
+        request_id = advisor.pending_requests.find(student, course)
+        if request_id is None:
+            return {"advisor": advisor.advisor_name, "results": {}, "status": "not pending"}
+        request_ids = [request_id]
+    else:
+        raise CommandError(f"{args.command} needs --request, --all, or --student and --course")
+    action = approve_many if args.command == "approve" else deny_many
+    return {"advisor": advisor.advisor_name,
+            "results": {str(request_id): status for request_id, status in action(advisor, request_ids, log).items()}}
+
+
+def run_roster(registry, args, log):
+    course = lookup(registry, "course", args.course)
+    try:
+        cursor = json.loads(args.cursor) if args.cursor else None
+        students, next_cursor = course.roster.page(args.sort, args.student_type, cursor, args.limit)
+    except (ValueError, TypeError) as error:
+        raise CommandError(f"invalid roster query: {error}") from None
+    result = course_json(course)
+    result["students"] = [student_json(student) for student in students]
+    result["next_cursor"] = next_cursor
+    return result
+
+
+def run_courses(registry, args, log):
+    return {"courses": [course_json(course, args.students) for course in registry.courses]}
+
+
+def run_student(registry, args, log):
+    student = lookup(registry, "student", args.student)
+    advisor = registry.get_advisor(student)
+    result = student_json(student)
+    result["courses"] = list(student.enrolled_courses)
+    result["advisor"] = advisor.advisor_name if advisor else None
+    return result
+
+
+def build_parser():
+    parser = CommandParser(prog="commands.py", description="Run enrolment commands without prompts. Each command "
+                           "prints one JSON line. With no command, or -, commands are read from stdin, one per line, "
+                           "and run against state loaded once.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    enrol_command = commands.add_parser("enrol", help="enrol a student; several --course options make a bundle")
+    enrol_command.add_argument("--student", required=True, help="student id or name")
+    enrol_command.add_argument("--course", required=True, action="append", help="course code or name")
+    enrol_command.set_defaults(run=run_enrol)
+    drop_command = commands.add_parser("drop", help="drop a student from a course")
+    drop_command.add_argument("--student", required=True)
+    drop_command.add_argument("--course", required=True)
+    drop_command.set_defaults(run=run_drop)
+    requests_command = commands.add_parser("requests", help="list an advisor's pending requests")
+    requests_command.add_argument("--advisor", required=True)
+    requests_command.set_defaults(run=run_requests)
+    for name in ("approve", "deny"):
+        decision = commands.add_parser(name, help=f"{name} pending requests")
+        decision.add_argument("--advisor", required=True)
+        decision.add_argument("--request", type=int, action="append", help="request id; may be repeated")
+        decision.add_argument("--all", action="store_true", help="every pending request")
+        decision.add_argument("--student")
+        decision.add_argument("--course")
+        decision.set_defaults(run=run_decision)
+    roster_command = commands.add_parser("roster", help="one page of a course roster")
+    roster_command.add_argument("--course", required=True)
+    roster_command.add_argument("--sort", choices=SORTS, default="time")
+    roster_command.add_argument("--type", dest="student_type")
+    roster_command.add_argument("--limit", type=int, help="default: the whole roster")
+    roster_command.add_argument("--cursor", help="next_cursor from the previous page")
+    roster_command.set_defaults(run=run_roster)
+    courses_command = commands.add_parser("courses", help="every course with its enrolment")
+    courses_command.add_argument("--students", action="store_true", help="include each course's students")
+    courses_command.set_defaults(run=run_courses)
+    student_command = commands.add_parser("student", help="a student's courses and advisor")
+    student_command.add_argument("--student", required=True)
+    student_command.set_defaults(run=run_student)
+    return parser
+
+
+def run_command(parser, registry, words, log=None):
+    # One JSON-ready result; failures are reported in it, never raised.
+    command = words[0] if words else None
+    try:
+        args = parser.parse_args(words)
+        return {"command": args.command, "ok": True, **args.run(registry, args, log)}
+    except (CommandError, LookupFailed) as error:
+        return {"command": command, "ok": False, "error": str(error)}
+
+
+def run_pipeline(parser, registry, lines, out, log=None):
+    failures = 0
+    for number, line in enumerate(lines, 1):
+        try:
+            words = shlex.split(line, comments=True)
+        except ValueError as error:
+            words, result = None, {"command": None, "ok": False, "error": str(error)}
+        if words == []:
+            continue
+        if words is not None and ("-h" in words or "--help" in words):
+            words, result = None, {"command": words[0], "ok": False, "error": "--help only works on the command line"}
+        if words is not None:
+            result = run_command(parser, registry, words, log)
+        result["line"] = number
+        failures += not result["ok"]
+        out.write(json.dumps(result) + "\n")
+        out.flush()
+        if log is not None and log.records >= COMPACT_EVERY:
+            save_state(registry, log)
+    return failures
+
+
+def close(registry, log):
+    if log.records >= COMPACT_EVERY:
+        save_state(registry, log)
+    log.close()
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    parser = build_parser()
+    if argv in ([], ["-"]):
+        registry, log = restore_state(batch_size=4096, batch_interval=1.0)
+        try:
+            failures = run_pipeline(parser, registry, sys.stdin, sys.stdout, log)
+        finally:
+            close(registry, log)
+        return 1 if failures else 0
+
+    # A usage error is reported before any state is loaded.
+    try:
+        parser.parse_args(argv)
+    except CommandError as error:
+        parser.print_usage(sys.stderr)
+        print(f"{parser.prog}: error: {error}", file=sys.stderr)
+        return 2
+    registry, log = restore_state()
+    try:
+        result = run_command(parser, registry, argv, log)
+    finally:
+        close(registry, log)
+    print(json.dumps(result))
+    return 0 if result["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+import threading
+from contextlib import ExitStack, nullcontext
+
+from task_3_advisor_approval import approve, deny, drop, enrol, enrol_bundle, promote_next
+
+
+class EnrolmentService:
+    # Thread-safe front for enrol/drop/approve/deny. Locks are always taken in
+    # the order student -> course -> advisor so two sessions can never
+    # deadlock. A bundle holds several course locks, always taken in
+    # course_code order. Every course and advisor has its own lock. Students share a
+    # fixed set of striped locks so memory stays bounded at a million students.
+    def __init__(self, registry, log=None, student_stripes=1024):
+        self.__registry = registry
+        self.__log = log
+        self.__course_locks = {course.course_code: threading.Lock() for course in registry.courses}
+        self.__advisor_locks = {id(advisor): threading.Lock() for advisor in registry.advisors}
+        self.__student_locks = [threading.Lock() for _ in range(student_stripes)]
+
+    @property
+    def registry(self):
+        return self.__registry
+
+    def __student_lock(self, student):
+        return self.__student_locks[hash(student.student_id) % len(self.__student_locks)]
+
+    def __course_lock(self, course):
+        lock = self.__course_locks.get(course.course_code)
+        if lock is None:
+            lock = self.__course_locks.setdefault(course.course_code, threading.Lock())
+        return lock
+
+    def __advisor_lock(self, advisor):
+        if advisor is None:
+            return nullcontext()
+        lock = self.__advisor_locks.get(id(advisor))
+        if lock is None:
+            lock = self.__advisor_locks.setdefault(id(advisor), threading.Lock())
+        return lock
+
+    def enrol(self, student, course):
+        advisor = self.__registry.get_advisor(student)
+        with self.__student_lock(student), self.__course_lock(course), self.__advisor_lock(advisor):
+            return enrol(self.__registry, student, course, self.__log)
+
+    def enrol_bundle(self, student, courses):
+        advisor = self.__registry.get_advisor(student)
+        with ExitStack() as locks:
+            locks.enter_context(self.__student_lock(student))
+            for course in sorted(set(courses), key=lambda course: course.course_code):
+                locks.enter_context(self.__course_lock(course))
+            locks.enter_context(self.__advisor_lock(advisor))
+            return enrol_bundle(self.__registry, student, courses, self.__log)
+
+    def drop(self, student, course):
+        with self.__student_lock(student), self.__course_lock(course):
+            status = drop(student, course, self.__log, promote_waitlist=False)
+        if status == "dropped":
+            self.__promote(course)
+        return status
+
+    def __promote(self, course):
+        # The head of the waitlist is read under the course lock, then settled
+        # under that student's lock and the course lock, in the usual order.
+        # If someone else changed the head in between, look again.
+        course_lock = self.__course_lock(course)
+        while True:
+            with course_lock:
+                if len(course.enrolled_students) >= course.max_capacity:
+                    return
+                candidate = course.waitlist.peek()
+            if candidate is None:
+                return
+            with self.__student_lock(candidate), course_lock:
+                if course.waitlist.peek() is candidate and len(course.enrolled_students) < course.max_capacity:
+                    promote_next(course, self.__log)
+
+    def approve(self, advisor, student, course):
+        with self.__student_lock(student), self.__course_lock(course), self.__advisor_lock(advisor):
+            return approve(advisor, student, course, self.__log)
+
+    def deny(self, advisor, student, course):
+        with self.__student_lock(student), self.__course_lock(course), self.__advisor_lock(advisor):
+            return deny(advisor, student, course, self.__log)
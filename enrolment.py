@@ -0,0 +1,40 @@
+import sys
+from importlib import import_module
+
+# Each command lives in its own module and is imported only when it runs, so
+# a script that launches one command pays for that command's imports alone.
+COMMANDS = {
+    "console": ("task_3_advisor_approval", "the interactive registrar console (the default)"),
+    "run": ("commands", "run commands without prompts, from arguments or stdin, as JSON lines"),
+    "batch": ("batch", "apply a file of enrolment requests"),
+    "allocate": ("allocation", "allocate seats from ranked preferences"),
+    "serve": ("api_server", "run the HTTP/JSON API"),
+    "analytics": ("analytics", "print fill rates, student mix and advisor load"),
+    "generate": ("synthetic", "write a synthetic institution as CSV files"),
+}
+
+
+def usage():
+    lines = ["usage: enrolment.py [command] [arguments]", "", "commands:"]
+    lines += [f"  {command:<12}{description}" for command, (_, description) in COMMANDS.items()]
+    lines += ["", "Run enrolment.py COMMAND --help for a command's arguments."]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] in ("-h", "--help"):
+        print(usage())
+        return 0
+    command = "console"
+    if argv and not argv[0].startswith("-"):
+        command = argv.pop(0)
+    if command not in COMMANDS:
+        print(f'Warning: unknown command "{command}".')
+        print(usage())
+        return 2
+    return import_module(COMMANDS[command][0]).main(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+import atexit
+import os
+import sys
+from time import perf_counter
+
+ENV_VAR = "ENROLMENT_INSTRUMENT"
+PROFILE_ENV_VAR = "ENROLMENT_PROFILE"
+
+_hot = []
+_timings = {}
+_counters = {}
+_enabled = False
+_profiler = None
+_profile_file = None
+
+
+def hot(name):
+    # Marks a function on the hot path. While instrumentation is off the
+    # function is returned as it is, so it costs nothing; enable() puts a
+    # timing wrapper in its place in its module, its class and every module
+    # that imported it.
+    def decorate(function):
+        timing = _timings.setdefault(name, [0, 0.0])
+
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                timing[0] += 1
+                timing[1] += perf_counter() - start
+
+        timed.__name__ = function.__name__
+        timed.__qualname__ = function.__qualname__
+        timed.__doc__ = function.__doc__
+        timed.__wrapped__ = function
+        _hot.append((function, timed))
+        return timed if _enabled else function
+    return decorate
+
+
+def count(name, amount=1):
+    if _enabled:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def enabled():
+    return _enabled
+
+
+def _install(function, timed):
+    path = function.__qualname__.split(".")
+    if len(path) > 1:
+        owner = sys.modules.get(function.__module__)
+        for part in path[:-1]:
+            owner = getattr(owner, part, None)
+        if owner is not None and owner.__dict__.get(path[-1]) is function:
+            setattr(owner, path[-1], timed)
+        return
+    for module in list(sys.modules.values()):
+        namespace = getattr(module, "__dict__", None)
+        if not namespace:
+            continue
+        for attribute, value in list(namespace.items()):
+            if value is function:
+                setattr(module, attribute, timed)
+
+
+def enable(profile_file=None):
+    global _enabled, _profiler, _profile_file
+    if not _enabled:
+        _enabled = True
+        for function, timed in _hot:
+            _install(function, timed)
+        atexit.register(_finish)
+    if profile_file and _profiler is None:
+        import cProfile
+        _profile_file = profile_file
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+
+
+def summary():
+    lines = [f"{'operation':<28}{'calls':>10}{'total ms':>12}{'mean us':>12}"]
+    for name, (calls, seconds) in sorted(_timings.items(), key=lambda item: -item[1][1]):
+        if calls:
+            lines.append(f"{name:<28}{calls:>10}{seconds * 1000:>12.2f}{seconds * 1e6 / calls:>12.1f}")
+    for name, value in sorted(_counters.items()):
+        lines.append(f"{name:<28}{value:>10}")
+    return "\n".join(lines)
+
+
+def _finish():
+    # Written to stderr so the summary never mixes with a command's output.
+    global _profiler
+    if _profiler is not None:
+        _profiler.disable()
+        _profiler.dump_stats(_profile_file)
+        _profiler = None
+        print(f"Profile written to {_profile_file}; read it with python3 -m pstats {_profile_file}", file=sys.stderr)
+    print("Session timings (nested operations are included in their callers):", file=sys.stderr)
+    print(summary(), file=sys.stderr)
+
+
+if os.environ.get(PROFILE_ENV_VAR):
+    enable(os.environ[PROFILE_ENV_VAR])
+elif os.environ.get(ENV_VAR, "") not in ("", "0"):
+    enable()
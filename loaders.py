@@ -0,0 +1,64 @@
+import csv
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+
+def iter_rows(file_name, chunk_size=DEFAULT_CHUNK_SIZE, parse_row=None):
+    # Yields lists of at most chunk_size parsed records. Rows that parse_row
+    # rejects with a ValueError are reported and skipped.
+    with open(file_name, 'r', newline='') as csv_file:
+        csv_reader = csv.reader(csv_file)
+        next(csv_reader, None)
+        chunk = []
+        for row in csv_reader:
+            if not row:
+                continue
+            try:
+                record = parse_row(row) if parse_row else row
+            except ValueError as error:
+                print(f"Warning: {file_name} line {csv_reader.line_num} skipped: {error}")
+                continue
+            chunk.append(record)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def parse_student_row(row):
+    if len(row) != 3:
+        raise ValueError(f"expected 3 columns, got {len(row)}")
+    student_id, name, student_type = row
+    return student_id, name, student_type
+
+
+def parse_course_row(row):
+    if len(row) != 3:
+        raise ValueError(f"expected 3 columns, got {len(row)}")
+    course_code, name, max_capacity = row
+    try:
+        max_capacity = int(max_capacity)
+    except ValueError:
+        raise ValueError(f'max_capacity "{max_capacity}" is not an integer') from None
+    if max_capacity < 0:
+        raise ValueError(f"max_capacity {max_capacity} is negative")
+    return course_code, name, max_capacity
+
+
+def parse_advisor_row(row):
+    if not row[0]:
+        raise ValueError("missing advisor name")
+    return row[0], row[1:]
+
+
+def iter_students(file_name, chunk_size=DEFAULT_CHUNK_SIZE):
+    return iter_rows(file_name, chunk_size, parse_student_row)
+
+
+def iter_courses(file_name, chunk_size=DEFAULT_CHUNK_SIZE):
+    return iter_rows(file_name, chunk_size, parse_course_row)
+
+
+def iter_advisors(file_name, chunk_size=DEFAULT_CHUNK_SIZE):
+    return iter_rows(file_name, chunk_size, parse_advisor_row)
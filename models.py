@@ -0,0 +1,236 @@
+import sys
+
+from instrument import hot
+from loaders import iter_advisors, iter_courses, iter_students
+from prompts import resolve
+from report import ReportCache, render_grid
+from request_queue import RequestQueue
+from roster import RosterIndex
+from waitlist import Waitlist
+
+MAX_COURSES = 4
+MAX_ADVISEES = 3
+
+
+class Student:
+    __slots__ = ("__student_id", "__student_name", "__student_type", "__enrolled_courses")
+
+    def __init__(self, student_id, name, student_type):
+        self.__student_id = student_id
+        self.__student_name = name
+        self.__student_type = sys.intern(student_type)
+        # A tuple of course names: at most four, so a scan is as quick as a
+        # dict lookup and takes a fraction of the memory. The empty tuple is
+        # shared by every student until their first enrolment.
+        self.__enrolled_courses = ()
+
+    @property
+    def student_id(self):
+        return self.__student_id
+
+    @property
+    def student_name(self):
+        return self.__student_name
+
+    @property
+    def student_type(self):
+        return self.__student_type
+
+    @property
+    def enrolled_courses(self):
+        return self.__enrolled_courses
+
+    def can_enroll(self):
+        return len(self.__enrolled_courses) < MAX_COURSES
+
+    def can_take(self, count):
+        # Whether count more courses still fit under MAX_COURSES.
+        return len(self.__enrolled_courses) + count <= MAX_COURSES
+
+    def add_course(self, course_name):
+        if course_name not in self.__enrolled_courses:
+            self.__enrolled_courses += (course_name,)
+
+    def drop_course(self, course_name):
+        if course_name in self.__enrolled_courses:
+            self.__enrolled_courses = tuple(name for name in self.__enrolled_courses if name != course_name)
+
+    def __str__(self):
+        return f"{self.__student_name} (ID: {self.__student_id}, Type: {self.__student_type})"
+
+
+class Course:
+    __slots__ = ("__course_code", "__course_name", "__max_capacity", "__enrolled_students", "__waitlist",
+                 "__version", "__roster")
+
+    def __init__(self, course_code, name, max_capacity):
+        self.__course_code = course_code
+        self.__course_name = name
+        self.__max_capacity = int(max_capacity)
+        self.__enrolled_students = {}
+        self.__waitlist = None
+        self.__version = 0
+        self.__roster = None
+
+    @property
+    def course_code(self):
+        return self.__course_code
+
+    @property
+    def course_name(self):
+        return self.__course_name
+
+    @property
+    def max_capacity(self):
+        return self.__max_capacity
+
+    @property
+    def enrolled_students(self):
+        return self.__enrolled_students.values()
+
+    @property
+    def waitlist(self):
+        if self.__waitlist is None:
+            self.__waitlist = Waitlist()
+        return self.__waitlist
+
+    @property
+    def roster(self):
+        if self.__roster is None:
+            self.__roster = RosterIndex(self)
+        return self.__roster
+
+    @property
+    def version(self):
+        # Bumped on every roster change so cached report rows can tell they are stale.
+        return self.__version
+
+    def add_student(self, student):
+        if len(self.__enrolled_students) >= self.__max_capacity:
+            return False
+        if student.student_id in self.__enrolled_students:
+            return False
+        self.__enrolled_students[student.student_id] = student
+        self.__version += 1
+        return True
+
+    def __contains__(self, student):
+        return student.student_id in self.__enrolled_students
+
+    def drop_student(self, student):
+        if student.student_id in self.__enrolled_students:
+            del self.__enrolled_students[student.student_id]
+            self.__version += 1
+            return True
+        return False
+
+    def __str__(self):
+        return f"{self.__course_name} (Code: {self.__course_code}, Enrolled: {len(self.__enrolled_students)}/{self.__max_capacity})"
+
+
+class Advisor:
+    def __init__(self, name):
+        self.__advisor_name = name
+        self.__assigned_students = []
+        self.__pending_requests = RequestQueue()
+
+    @property
+    def advisor_name(self):
+        return self.__advisor_name
+
+    @property
+    def assigned_students(self):
+        return self.__assigned_students
+
+    @property
+    def pending_requests(self):
+        return self.__pending_requests
+
+    def add_assigned_student(self, student):
+        if len(self.__assigned_students) < MAX_ADVISEES:
+            self.__assigned_students.append(student)
+            return True
+        return False
+
+    def add_request(self, student, course, priority=0, request_id=None):
+        return self.__pending_requests.add(student, course, priority, request_id)
+
+    def approve_request(self, student, course):
+        return self.__pending_requests.discard(student, course)
+
+    def deny_request(self, student, course):
+        return self.__pending_requests.discard(student, course)
+
+    def __str__(self):
+        return self.__advisor_name
+
+
+@hot("load.students")
+def load_students(file_name):
+    students = []
+    for chunk in iter_students(file_name):
+        students.extend(Student(student_id, name, student_type) for student_id, name, student_type in chunk)
+    return students
+
+
+@hot("load.courses")
+def load_courses(file_name):
+    courses = []
+    for chunk in iter_courses(file_name):
+        courses.extend(Course(course_code, name, max_capacity) for course_code, name, max_capacity in chunk)
+    return courses
+
+
+@hot("load.advisors")
+def load_advisors(file_name, students):
+    students_by_id = {student.student_id: student for student in students}
+    advisors = []
+    for chunk in iter_advisors(file_name):
+        for advisor_name, student_ids in chunk:
+            advisor = Advisor(advisor_name)
+            for student_id in student_ids:
+                student = students_by_id.get(student_id)
+                if student is None:
+                    print(f'Warning: advisor "{advisor.advisor_name}" lists unknown student ID "{student_id}".')
+                elif not advisor.add_assigned_student(student):
+                    print(f'Warning: advisor "{advisor.advisor_name}" already has {MAX_ADVISEES} students, "{student_id}" not assigned.')
+            advisors.append(advisor)
+    return advisors
+
+
+# Console steps shared by Problem_1 and problem_2.
+def enrol_student(registry):
+    course = resolve("Enter the name or code of the course: ", registry.find_courses, registry.search_courses)
+    student = resolve("Enter the name or ID of the student: ", registry.find_students, registry.search_students)
+
+    if course.course_name in student.enrolled_courses:
+        print(f"Student {student.student_name} is already enrolled in {course.course_name}.")
+        print(f'Failure! Student "{student.student_name}" NOT enrolled in course "{course.course_name}".')
+        return
+
+    if not student.can_enroll():
+        print(f"Student {student.student_name} cannot enroll in more than {MAX_COURSES} courses.")
+        return
+
+    if course.add_student(student):
+        student.add_course(course.course_name)
+        print(f'Success! Student "{student.student_name}" enrolled in course "{course.course_name}".')
+    else:
+        print(f"Failure! Student \"{student.student_name}\" NOT enrolled in course \"{course.course_name}\".")
+
+
+def list_enrolled(registry):
+    course = resolve("Enter the name or code of the course: ", registry.find_courses, registry.search_courses,
+                     retry=False)
+    if course:
+        print(
+            f"{course.course_name} (Code: {course.course_code}, Enrolled: {len(course.enrolled_students)}/{course.max_capacity})")
+        if not course.enrolled_students:
+            print("  None")
+        else:
+            for student in course.enrolled_students:
+                print(f"  {student}")
+
+
+def list_all_courses(courses):
+    render_grid(ReportCache().rows(courses))
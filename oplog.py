@@ -0,0 +1,184 @@
+import json
+import os
+import threading
+import time
+
+from instrument import hot
+
+LOG_FILE = "enrolment.log"
+COMPACT_EVERY = 10_000
+
+
+class OpLog:
+    # Records are JSON lines of [sequence, operation, *arguments]. Appends are
+    # buffered and fsynced as a group once batch_size records or batch_interval
+    # seconds have accumulated, so a crash can lose at most one unsynced batch.
+    # Appends from several threads are serialised by an internal lock. An
+    # explicit sync() fsyncs outside that lock, so it can run on another
+    # thread without holding up appends.
+    def __init__(self, file_name, sequence=0, batch_size=64, batch_interval=0.05, records=0):
+        # records counts what the file already holds, so compaction also
+        # happens for processes that only ever append a few records.
+        self.__file_name = file_name
+        self.__sequence = sequence
+        self.__batch_size = batch_size
+        self.__batch_interval = batch_interval
+        self.__unsynced = 0
+        self.__last_sync = time.monotonic()
+        self.__records = records
+        self.__lock = threading.Lock()
+        # Held by sync(), truncate() and close(), so a file is never closed under an fsync.
+        self.__sync_lock = threading.Lock()
+        self.__log_file = open(file_name, "a", encoding="utf-8")
+
+    @property
+    def sequence(self):
+        return self.__sequence
+
+    @property
+    def records(self):
+        return self.__records
+
+    def append(self, operation, *arguments):
+        with self.__lock:
+            self.__sequence += 1
+            self.__log_file.write(json.dumps([self.__sequence, operation, *arguments], separators=(",", ":")) + "\n")
+            self.__records += 1
+            self.__unsynced += 1
+            if self.__unsynced >= self.__batch_size or time.monotonic() - self.__last_sync >= self.__batch_interval:
+                self.__sync()
+            return self.__sequence
+
+    def append_many(self, operation, rows):
+        # One record per row of arguments, written under a single lock
+        # acquisition and synced at most once.
+        with self.__lock:
+            sequence = self.__sequence
+            lines = []
+            for arguments in rows:
+                sequence += 1
+                lines.append(json.dumps([sequence, operation, *arguments], separators=(",", ":")) + "\n")
+            if not lines:
+                return sequence
+            self.__log_file.write("".join(lines))
+            self.__sequence = sequence
+            self.__records += len(lines)
+            self.__unsynced += len(lines)
+            if self.__unsynced >= self.__batch_size or time.monotonic() - self.__last_sync >= self.__batch_interval:
+                self.__sync()
+            return sequence
+
+    def sync(self):
+        with self.__sync_lock:
+            with self.__lock:
+                if not self.__unsynced:
+                    self.__last_sync = time.monotonic()
+                    return
+                self.__log_file.flush()
+                self.__unsynced = 0
+                log_file = self.__log_file
+            os.fsync(log_file.fileno())
+            self.__last_sync = time.monotonic()
+
+    def __sync(self):
+        if self.__unsynced:
+            self.__log_file.flush()
+            os.fsync(self.__log_file.fileno())
+            self.__unsynced = 0
+        self.__last_sync = time.monotonic()
+
+    def truncate(self):
+        # Only call once a snapshot covering self.sequence is safely on disk.
+        with self.__sync_lock, self.__lock:
+            self.__log_file.close()
+            self.__log_file = open(self.__file_name, "w", encoding="utf-8")
+            self.__unsynced = 0
+            self.__records = 0
+
+    def close(self):
+        with self.__sync_lock, self.__lock:
+            self.__sync()
+            self.__log_file.close()
+
+
+def read_log(file_name):
+    # Yields (sequence, operation, arguments, end_offset). Reading stops at the
+    # first torn or corrupt line, which can only be the unsynced tail.
+    if not os.path.exists(file_name):
+        return
+    with open(file_name, "rb") as log_file:
+        offset = 0
+        for line in log_file:
+            if not line.endswith(b"\n"):
+                return
+            try:
+                sequence, operation, *arguments = json.loads(line)
+            except ValueError:
+                return
+            offset += len(line)
+            yield sequence, operation, arguments, offset
+
+
+def apply_record(registry, operation, arguments):
+    if operation == "bundle":
+        student = registry.get_student_by_id(arguments[0])
+        courses = [registry.get_course_by_code(course_code) for course_code in arguments[1:]]
+        if student is None or None in courses:
+            return False
+        for course in courses:
+            course.waitlist.discard(student)
+            if course.add_student(student):
+                student.add_course(course.course_name)
+        return True
+    if operation in ("enrol", "drop", "waitlist", "unwaitlist"):
+        course_code, student_id, *advisor_name = arguments
+        advisor = registry.get_advisor_by_name(advisor_name[0]) if advisor_name else None
+    else:
+        # request records also carry the request id, so ids survive a restart.
+        advisor_name, course_code, student_id, *request_id = arguments
+        advisor = registry.get_advisor_by_name(advisor_name)
+    course = registry.get_course_by_code(course_code)
+    student = registry.get_student_by_id(student_id)
+    if course is None or student is None:
+        return False
+    if operation == "enrol":
+        course.waitlist.discard(student)
+        if course.add_student(student):
+            student.add_course(course.course_name)
+    elif operation == "drop":
+        if course.drop_student(student):
+            student.drop_course(course.course_name)
+    elif operation == "waitlist":
+        if advisor is not None:
+            advisor.approve_request(student, course)
+        course.waitlist.add(student)
+    elif operation == "unwaitlist":
+        course.waitlist.discard(student)
+    elif advisor is None:
+        return False
+    elif operation == "request":
+        advisor.add_request(student, course, request_id=request_id[0] if request_id else None)
+    elif operation == "approve":
+        if course.add_student(student):
+            student.add_course(course.course_name)
+        advisor.approve_request(student, course)
+    elif operation == "deny":
+        advisor.deny_request(student, course)
+    else:
+        return False
+    return True
+
+
+@hot("load.replay")
+def recover(file_name, registry, after=0):
+    # Replays every record newer than the snapshot, drops any torn tail and
+    # returns the last sequence number seen.
+    last_sequence = after
+    valid_size = 0
+    for sequence, operation, arguments, valid_size in read_log(file_name):
+        if sequence > after:
+            apply_record(registry, operation, arguments)
+            last_sequence = sequence
+    if os.path.exists(file_name) and os.path.getsize(file_name) != valid_size:
+        os.truncate(file_name, valid_size)
+    return last_sequence
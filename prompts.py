@@ -0,0 +1,40 @@
+def choose(heading, options):
+    print(heading)
+    for number, option in enumerate(options, 1):
+        print(f"  {number}. {option}")
+    answer = input("Enter a number to choose, or press Enter to try again: ").strip()
+    if answer.isdigit() and 1 <= int(answer) <= len(options):
+        return options[int(answer) - 1]
+    return None
+
+
+def resolve(prompt, lookup, search, retry=True, not_found='"{}" not found.', allow_empty=False):
+    # lookup returns every exact match for an id, code or name. A single one
+    # is taken as it is, and a shared name asks which one was meant. With no
+    # exact match, the closest names are offered and the operator picks one
+    # or types again.
+    while True:
+        text = input(prompt).strip()
+        if not text and allow_empty:
+            return None
+        matches = lookup(text) if text else []
+        if len(matches) == 1:
+            return matches[0]
+        if matches:
+            match = choose(f'"{text}" matches {len(matches)} records. Which one did you mean:', matches)
+            if match:
+                return match
+            if retry:
+                continue
+            print(not_found.format(text))
+            return None
+        suggestions = search(text) if text else []
+        if suggestions:
+            match = choose(f'"{text}" not found. Did you mean:', suggestions)
+            if match:
+                return match
+        if not retry:
+            print(not_found.format(text))
+            return None
+        if not suggestions:
+            print(not_found.format(text) + " Try again.")
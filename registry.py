@@ -0,0 +1,181 @@
+from instrument import hot
+from search import MAX_RESULTS, SearchIndex
+
+
+def fold(name):
+    return name.strip().casefold()
+
+
+class Registry:
+    @hot("load.registry")
+    def __init__(self, students=(), courses=(), advisors=()):
+        self.__students = []
+        self.__courses = []
+        self.__advisors = []
+        self.__students_by_id = {}
+        self.__students_by_name = {}
+        self.__courses_by_code = {}
+        self.__courses_by_name = {}
+        self.__advisors_by_name = {}
+        self.__advisor_by_student_id = {}
+        self.__student_search = None
+        self.__course_search = None
+        self.__advisor_search = None
+        for student in students:
+            self.add_student(student)
+        for course in courses:
+            self.add_course(course)
+        for advisor in advisors:
+            self.add_advisor(advisor)
+
+    @property
+    def students(self):
+        return self.__students
+
+    @property
+    def courses(self):
+        return self.__courses
+
+    @property
+    def advisors(self):
+        return self.__advisors
+
+    def add_student(self, student):
+        if student.student_id in self.__students_by_id:
+            return False
+        self.__students.append(student)
+        self.__students_by_id[student.student_id] = student
+        self.__students_by_name.setdefault(fold(student.student_name), []).append(student)
+        if self.__student_search is not None:
+            self.__student_search.add(student)
+        return True
+
+    def drop_student(self, student):
+        if self.__students_by_id.get(student.student_id) is not student:
+            return False
+        del self.__students_by_id[student.student_id]
+        self.__students.remove(student)
+        _unindex(self.__students_by_name, fold(student.student_name), student)
+        self.__advisor_by_student_id.pop(student.student_id, None)
+        if self.__student_search is not None:
+            self.__student_search.remove(student)
+        return True
+
+    def add_course(self, course):
+        if course.course_code in self.__courses_by_code:
+            return False
+        self.__courses.append(course)
+        self.__courses_by_code[course.course_code] = course
+        self.__courses_by_name.setdefault(fold(course.course_name), []).append(course)
+        if self.__course_search is not None:
+            self.__course_search.add(course)
+        return True
+
+    def drop_course(self, course):
+        if self.__courses_by_code.get(course.course_code) is not course:
+            return False
+        del self.__courses_by_code[course.course_code]
+        self.__courses.remove(course)
+        _unindex(self.__courses_by_name, fold(course.course_name), course)
+        if self.__course_search is not None:
+            self.__course_search.remove(course)
+        return True
+
+    def add_advisor(self, advisor):
+        self.__advisors.append(advisor)
+        self.__advisors_by_name.setdefault(fold(advisor.advisor_name), []).append(advisor)
+        if self.__advisor_search is not None:
+            self.__advisor_search.add(advisor)
+        for student in advisor.assigned_students:
+            self.__advisor_by_student_id.setdefault(student.student_id, advisor)
+
+    def drop_advisor(self, advisor):
+        if advisor not in self.__advisors:
+            return False
+        self.__advisors.remove(advisor)
+        _unindex(self.__advisors_by_name, fold(advisor.advisor_name), advisor)
+        if self.__advisor_search is not None:
+            self.__advisor_search.remove(advisor)
+        for student in advisor.assigned_students:
+            if self.__advisor_by_student_id.get(student.student_id) is advisor:
+                del self.__advisor_by_student_id[student.student_id]
+                self.__reindex_student_advisor(student)
+        return True
+
+    def assign_student(self, advisor, student):
+        if not advisor.add_assigned_student(student):
+            return False
+        self.__advisor_by_student_id.setdefault(student.student_id, advisor)
+        return True
+
+    def __reindex_student_advisor(self, student):
+        # Another advisor may also list the student; fall back to the first one.
+        for advisor in self.__advisors:
+            if student in advisor.assigned_students:
+                self.__advisor_by_student_id[student.student_id] = advisor
+                return
+
+    def get_student(self, name):
+        matches = self.__students_by_name.get(fold(name))
+        return matches[0] if matches else None
+
+    def get_student_by_id(self, student_id):
+        return self.__students_by_id.get(student_id.strip())
+
+    def get_course(self, name):
+        matches = self.__courses_by_name.get(fold(name))
+        return matches[0] if matches else None
+
+    def get_course_by_code(self, course_code):
+        return self.__courses_by_code.get(course_code.strip())
+
+    def get_advisor_by_name(self, name):
+        matches = self.__advisors_by_name.get(fold(name))
+        return matches[0] if matches else None
+
+    @hot("lookup.advisor_of")
+    def get_advisor(self, student):
+        return self.__advisor_by_student_id.get(student.student_id)
+
+    # A student id or course code (typed in either case) matches one record;
+    # a name may match several.
+    @hot("lookup.students")
+    def find_students(self, key):
+        student = self.get_student_by_id(key) or self.get_student_by_id(key.upper())
+        return [student] if student else list(self.__students_by_name.get(fold(key), ()))
+
+    @hot("lookup.courses")
+    def find_courses(self, key):
+        course = self.get_course_by_code(key) or self.get_course_by_code(key.upper())
+        return [course] if course else list(self.__courses_by_name.get(fold(key), ()))
+
+    @hot("lookup.advisors")
+    def find_advisors(self, name):
+        return list(self.__advisors_by_name.get(fold(name), ()))
+
+    # The search indexes are built on first use and kept up to date after that.
+    @hot("search.students")
+    def search_students(self, text, limit=MAX_RESULTS):
+        if self.__student_search is None:
+            self.__student_search = SearchIndex(lambda student: (student.student_id, student.student_name), self.__students)
+        return self.__student_search.search(text, limit)
+
+    @hot("search.courses")
+    def search_courses(self, text, limit=MAX_RESULTS):
+        if self.__course_search is None:
+            self.__course_search = SearchIndex(lambda course: (course.course_code, course.course_name), self.__courses)
+        return self.__course_search.search(text, limit)
+
+    @hot("search.advisors")
+    def search_advisors(self, text, limit=MAX_RESULTS):
+        if self.__advisor_search is None:
+            self.__advisor_search = SearchIndex(lambda advisor: (None, advisor.advisor_name), self.__advisors)
+        return self.__advisor_search.search(text, limit)
+
+
+def _unindex(index, key, item):
+    matches = index.get(key)
+    if matches and item in matches:
+        matches.remove(item)
+        if not matches:
+            del index[key]
@@ -0,0 +1,114 @@
+import sys
+import unicodedata
+
+from instrument import count
+
+HEADERS = ("Course Code", "Course Name", "Max Capacity", "Enrolled Students", "Student Names")
+PAGE_SIZE = 200
+
+
+class ReportCache:
+    # Rows of the all-courses report keyed by course code. Each row remembers
+    # the roster version it was built from, so a course is only re-rendered
+    # after add_student or drop_student has changed it.
+    def __init__(self):
+        self.__rows = {}
+
+    def __len__(self):
+        return len(self.__rows)
+
+    def row(self, course):
+        cached = self.__rows.get(course.course_code)
+        if cached is not None and cached[0] == course.version:
+            return cached[1]
+        count("report rows rebuilt")
+        names = ", ".join([student.student_name for student in course.enrolled_students]) or "None"
+        row = (course.course_code, course.course_name, course.max_capacity, len(course.enrolled_students), names)
+        self.__rows[course.course_code] = (course.version, row)
+        return row
+
+    def rows(self, courses):
+        for course in courses:
+            yield self.row(course)
+
+
+def student_json(student):
+    return {"student_id": student.student_id, "name": student.student_name, "student_type": student.student_type}
+
+
+def course_json(course, with_students=False):
+    result = {"course_code": course.course_code, "course_name": course.course_name,
+              "max_capacity": course.max_capacity, "enrolled": len(course.enrolled_students),
+              "waitlisted": len(course.waitlist)}
+    if with_students:
+        result["students"] = [student_json(student) for student in course.enrolled_students]
+    return result
+
+
+def display_width(text):
+    # Terminal columns, measured the way tabulate does with wcwidth: wide
+    # East Asian characters take two, combining marks take none.
+    if text.isascii():
+        return len(text)
+    return sum(0 if unicodedata.combining(char) else 2 if unicodedata.east_asian_width(char) in ("W", "F") else 1
+               for char in text)
+
+
+def pad(text, width, right=False):
+    fill = " " * (width - display_width(text))
+    return fill + text if right else text + fill
+
+
+def pages(rows, page_size=PAGE_SIZE):
+    page = []
+    for row in rows:
+        page.append(row)
+        if len(page) >= page_size:
+            yield page
+            page = []
+    if page:
+        yield page
+
+
+def render_grid(rows, out=None, page_size=PAGE_SIZE):
+    # Draws the same table as tabulate's "grid" format for these columns
+    # (text left-aligned, counts right-aligned, headers padded by two), but
+    # never imports tabulate. Each page is written as a table of its own,
+    # with its own header and column widths, so the report streams instead
+    # of being measured as a whole first; widths can differ between pages.
+    out = out or sys.stdout
+    for page in pages(rows, page_size):
+        cells = [tuple(str(value) for value in row) for row in page]
+        widths = [max([len(header) + 2] + [display_width(line[column]) for line in cells])
+                  for column, header in enumerate(HEADERS)]
+        numeric = [all(isinstance(row[column], int) for row in page) for column in range(len(HEADERS))]
+
+        def line(values):
+            return "| " + " | ".join(pad(value, width, right)
+                                     for value, width, right in zip(values, widths, numeric)) + " |"
+
+        border = "+" + "+".join("-" * (width + 2) for width in widths) + "+"
+        out.write("\n".join([border, line(HEADERS), border.replace("-", "=")]))
+        out.write("\n")
+        for values in cells:
+            out.write(line(values))
+            out.write("\n")
+            out.write(border)
+            out.write("\n")
+
+
+def render_plain(rows, out=None, page_size=PAGE_SIZE):
+    # One line per course with the first four columns padded to the widest
+    # value on the page. Pages are written as they are built, so as in
+    # render_grid the widths can differ between pages.
+    out = out or sys.stdout
+    for page in pages(rows, page_size):
+        cells = [HEADERS] + [tuple(str(value) for value in row) for row in page]
+        widths = [max(display_width(line[column]) for line in cells) for column in range(4)]
+        out.write("\n".join("  ".join([pad(line[0], widths[0]), pad(line[1], widths[1]),
+                                       pad(line[2], widths[2], True), pad(line[3], widths[3], True), line[4]])
+                            for line in cells))
+        out.write("\n")
+
+
+RENDERERS = {"grid": render_grid, "plain": render_plain}
@@ -0,0 +1,91 @@
+import heapq
+
+
+class RequestQueue:
+    # Pending (student, course) requests keyed by a stable request id. Lookup
+    # and removal by id or by (student, course) are O(1). Requests are ordered
+    # by priority (lower first) and then by submission order. While every
+    # request has the default priority, that order is just the dict order.
+    def __init__(self):
+        self.__requests = {}
+        self.__ids = {}
+        self.__heap = []
+        self.__prioritised = 0
+        self.__next_id = 1
+
+    def __len__(self):
+        return len(self.__requests)
+
+    @property
+    def next_id(self):
+        return self.__next_id
+
+    def advance(self, next_id):
+        # Ids below next_id are never handed out again, even once the
+        # requests that held them are gone.
+        self.__next_id = max(self.__next_id, next_id)
+
+    def __iter__(self):
+        for _, student, course in self.items():
+            yield student, course
+
+    def add(self, student, course, priority=0, request_id=None):
+        # request_id is only passed when restoring a saved or logged queue.
+        if priority < 0:
+            raise ValueError("priority must not be negative")
+        key = (student.student_id, course.course_code)
+        if key in self.__ids:
+            return self.__ids[key]
+        if request_id is None:
+            request_id = self.__next_id
+        self.__next_id = max(self.__next_id, request_id + 1)
+        self.__requests[request_id] = (priority, student, course)
+        self.__ids[key] = request_id
+        heapq.heappush(self.__heap, (priority, request_id))
+        if priority:
+            self.__prioritised += 1
+        return request_id
+
+    def get(self, request_id):
+        request = self.__requests.get(request_id)
+        return request[1:] if request else None
+
+    def priority(self, request_id):
+        return self.__requests[request_id][0]
+
+    def find(self, student, course):
+        return self.__ids.get((student.student_id, course.course_code))
+
+    def remove(self, request_id):
+        request = self.__requests.pop(request_id, None)
+        if request is None:
+            return False
+        priority, student, course = request
+        del self.__ids[(student.student_id, course.course_code)]
+        if priority:
+            self.__prioritised -= 1
+        if len(self.__heap) > 2 * len(self.__requests) + 16:
+            self.__heap = [(priority, request_id) for request_id, (priority, _, _) in self.__requests.items()]
+            heapq.heapify(self.__heap)
+        return True
+
+    def discard(self, student, course):
+        request_id = self.find(student, course)
+        return request_id is not None and self.remove(request_id)
+
+    def first(self):
+        heap = self.__heap
+        while heap and heap[0][1] not in self.__requests:
+            heapq.heappop(heap)
+        if not heap:
+            return None
+        request_id = heap[0][1]
+        return (request_id, *self.__requests[request_id][1:])
+
+    def items(self):
+        # (request_id, student, course) in queue order.
+        if self.__prioritised:
+            ordered = sorted(self.__requests.items(), key=lambda item: (item[1][0], item[0]))
+        else:
+            ordered = self.__requests.items()
+        return [(request_id, student, course) for request_id, (_, student, course) in ordered]
@@ -0,0 +1,75 @@
+from bisect import bisect_right
+
+from instrument import count, hot
+from registry import fold
+
+SORTS = ("time", "id", "name")
+PAGE_SIZE = 50
+
+
+class RosterIndex:
+    # Sorted views of one course's roster, built the first time they are asked
+    # for and kept until the roster changes (course.version), so paging through
+    # a large lecture does not sort it again for every page. Pages are found by
+    # bisecting on the sort key of the last student shown, which stays valid
+    # when students enrol or drop between pages.
+    def __init__(self, course):
+        self.__course = course
+        self.__version = None
+        self.__ordinals = {}
+        self.__next_ordinal = 0
+        self.__orders = {}
+
+    def __refresh(self):
+        course = self.__course
+        if self.__version == course.version:
+            return
+        count("roster indexes rebuilt")
+        # The roster dict is in enrolment order. A student keeps their ordinal
+        # until it falls out of that order, which means they dropped and
+        # enrolled again since the last refresh.
+        ordinals = {}
+        last = -1
+        for student in course.enrolled_students:
+            ordinal = self.__ordinals.get(student.student_id)
+            if ordinal is None or ordinal < last:
+                ordinal = self.__next_ordinal
+                self.__next_ordinal += 1
+            ordinals[student.student_id] = last = ordinal
+        self.__ordinals = ordinals
+        self.__orders = {}
+        self.__version = course.version
+
+    def key(self, sort, student):
+        if sort == "id":
+            return (student.student_id,)
+        if sort == "name":
+            return (fold(student.student_name), student.student_id)
+        return (self.__ordinals[student.student_id],)
+
+    def __order(self, sort, student_type):
+        order = self.__orders.get((sort, student_type))
+        if order is None:
+            students = [student for student in self.__course.enrolled_students
+                        if student_type is None or fold(student.student_type) == student_type]
+            if sort != "time":
+                students.sort(key=lambda student: self.key(sort, student))
+            order = self.__orders[(sort, student_type)] = ([self.key(sort, student) for student in students], students)
+        return order
+
+    def count(self, sort="time", student_type=None):
+        self.__refresh()
+        return len(self.__order(sort, fold(student_type) if student_type else None)[1])
+
+    @hot("lookup.roster_page")
+    def page(self, sort="time", student_type=None, cursor=None, limit=PAGE_SIZE):
+        # Returns (students, next_cursor); next_cursor is None on the last page.
+        if sort not in SORTS:
+            raise ValueError(f"sort must be one of {', '.join(SORTS)}")
+        if limit is not None and limit < 1:
+            raise ValueError("limit must be at least 1")
+        self.__refresh()
+        keys, students = self.__order(sort, fold(student_type) if student_type else None)
+        start = 0 if cursor is None else bisect_right(keys, tuple(cursor))
+        end = len(students) if limit is None else min(start + limit, len(students))
+        return students[start:end], (list(keys[end - 1]) if end < len(students) else None)
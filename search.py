@@ -0,0 +1,196 @@
+import re
+from bisect import bisect_left, insort
+
+WORD = re.compile(r"\w+")
+MAX_RESULTS = 10
+PREFIX_WORDS = 2_000
+CANDIDATES = 20_000
+
+
+def words(text):
+    return WORD.findall(text.casefold())
+
+
+def typo_tolerant(word):
+    # Short words and ids have too many one-edit neighbours to be useful.
+    return len(word) >= 4 and word.isalpha()
+
+
+def deletions(word):
+    return {word[:n] + word[n + 1:] for n in range(len(word))}
+
+
+def within_one_edit(a, b):
+    # One insertion, deletion, substitution or swap of neighbouring letters.
+    if abs(len(a) - len(b)) > 1:
+        return False
+    n = 0
+    while n < len(a) and n < len(b) and a[n] == b[n]:
+        n += 1
+    if len(a) > len(b):
+        return a[n + 1:] == b[n:]
+    if len(a) < len(b):
+        return a[n:] == b[n + 1:]
+    return (a[n + 1:] == b[n + 1:]
+            or (n + 1 < len(a) and a[n] == b[n + 1] and a[n + 1] == b[n] and a[n + 2:] == b[n + 2:]))
+
+
+def word_score(query_word, word):
+    # 0 for an exact word, 1 for a prefix, 2 for one typo, None otherwise.
+    if word == query_word:
+        return 0
+    if word.startswith(query_word):
+        return 1
+    if typo_tolerant(query_word) and within_one_edit(query_word, word):
+        return 2
+    return None
+
+
+class SearchIndex:
+    # Ranked, typo-tolerant lookup of entities by name and key (student id,
+    # course code). Every word of the name, and the key, is indexed. A query
+    # word matches an indexed word exactly, as a prefix (found by bisecting
+    # the sorted word list), or within one typo (found through an index of
+    # each word with one letter deleted). Only entities holding a match for
+    # the rarest query word are scored, so a search touches a handful of
+    # postings rather than the whole population.
+    def __init__(self, describe, entities=()):
+        # describe(entity) returns its (key, name); key may be None.
+        self.__describe = describe
+        self.__postings = {}
+        self.__deletions = {}
+        for entity in entities:
+            for word in self.__words(entity):
+                postings = self.__postings.get(word)
+                if postings is None:
+                    postings = self.__postings[word] = []
+                    self.__index_deletions(word)
+                postings.append(entity)
+        self.__sorted_words = sorted(self.__postings)
+
+    def __words(self, entity):
+        key, name = self.__describe(entity)
+        return dict.fromkeys(words(name) + [key.casefold()] if key else words(name))
+
+    def __index_deletions(self, word):
+        if typo_tolerant(word):
+            for variant in deletions(word):
+                self.__deletions.setdefault(variant, set()).add(word)
+
+    def add(self, entity):
+        for word in self.__words(entity):
+            postings = self.__postings.get(word)
+            if postings is None:
+                postings = self.__postings[word] = []
+                self.__index_deletions(word)
+                insort(self.__sorted_words, word)
+            postings.append(entity)
+
+    def remove(self, entity):
+        for word in self.__words(entity):
+            postings = self.__postings.get(word)
+            if not postings or entity not in postings:
+                continue
+            postings.remove(entity)
+            if postings:
+                continue
+            del self.__postings[word]
+            del self.__sorted_words[bisect_left(self.__sorted_words, word)]
+            if typo_tolerant(word):
+                for variant in deletions(word):
+                    neighbours = self.__deletions[variant]
+                    neighbours.discard(word)
+                    if not neighbours:
+                        del self.__deletions[variant]
+
+    def __matching_words(self, query_word):
+        # {indexed word: score} for the words query_word matches, best first,
+        # and whether the prefix matches had to be cut short.
+        found = {query_word: 0} if query_word in self.__postings else {}
+        start = bisect_left(self.__sorted_words, query_word)
+        prefixes = self.__sorted_words[start:start + PREFIX_WORDS + 1]
+        for word in prefixes:
+            if not word.startswith(query_word):
+                break
+            found.setdefault(word, 1)
+        else:
+            if len(prefixes) > PREFIX_WORDS:
+                return found, False
+        if typo_tolerant(query_word):
+            neighbours = set(self.__deletions.get(query_word, ()))
+            for variant in deletions(query_word):
+                neighbours.update(self.__deletions.get(variant, ()))
+                if variant in self.__postings:
+                    neighbours.add(variant)
+            for word in neighbours:
+                if word not in found and within_one_edit(query_word, word):
+                    found[word] = 2
+        return found, True
+
+    def search(self, text, limit=MAX_RESULTS):
+        query = list(dict.fromkeys(words(text)))
+        if not query:
+            return []
+        matches = []
+        for query_word in query:
+            matching, complete = self.__matching_words(query_word)
+            if not matching:
+                return []
+            matches.append((query_word, matching, complete, sum(len(self.__postings[word]) for word in matching)))
+        matches.sort(key=lambda match: match[3])
+
+        # Start from the postings of the rarest query word, best matches
+        # first, and narrow them down with the postings of the others while
+        # that is cheaper than checking each candidate's words.
+        candidates = {}
+        for word, tier in matches[0][1].items():
+            for entity in self.__postings[word]:
+                candidates.setdefault(id(entity), (entity, tier))
+            if len(candidates) >= CANDIDATES:
+                break
+        for _, matching, complete, size in matches[1:]:
+            if not complete or size > 20 * len(candidates):
+                break
+            found = {id(entity) for word in matching for entity in self.__postings[word]}
+            candidates = {key: candidate for key, candidate in candidates.items() if key in found}
+
+        # Candidates arrive in tier order and none can score below its tier,
+        # so once limit results score no worse than the current tier, later
+        # tiers are not looked at. The rest of the current tier is only
+        # scored for exact names, name prefixes and exact keys, which can
+        # still rank ahead of the results already found.
+        folded = " ".join(query)
+        ranked = []
+        totals = [0] * (2 * len(query) + 1)
+        cutoff = None
+        for entity, tier in candidates.values():
+            if cutoff is None and sum(totals[:tier + 1]) >= limit:
+                cutoff = tier
+            if cutoff is not None:
+                if tier > cutoff:
+                    break
+                key, name = self.__describe(entity)
+                if not (name.casefold().startswith(query[0]) or key and key.casefold() == folded):
+                    continue
+            entity_words = self.__words(entity)
+            total = 0
+            for query_word, matching, complete, _ in matches:
+                best = min([matching.get(entity_word, 3) for entity_word in entity_words])
+                if best == 3 and not complete:
+                    best = min([word_score(query_word, entity_word) or 3 for entity_word in entity_words])
+                if best == 3:
+                    break
+                total += best
+            else:
+                totals[total] += 1
+                key, name = self.__describe(entity)
+                name = " ".join(words(name))
+                key = key.casefold() if key else ""
+                exact = 0 if folded in (name, key) else 1
+                if key.startswith(folded):
+                    rank = (exact, total, 0, 0, key)
+                else:
+                    rank = (exact, total, 0 if name.startswith(folded) else 1, 1, len(name), name)
+                ranked.append((rank, entity))
+        ranked.sort(key=lambda item: item[0])
+        return [entity for _, entity in ranked[:limit]]
@@ -0,0 +1,273 @@
+import multiprocessing
+import os
+import zlib
+from array import array
+
+import numpy as np
+
+from arrays import positions
+from models import MAX_COURSES
+from task_3_advisor_approval import enrol
+
+BATCH_SIZE = 20_000
+# Smaller calls to enrol_many run enrol() in this process until the workers
+# have been started: below this size they cost more than they save.
+MIN_SHARDED = 50_000
+# WAITING is "waitlisted" for a student who was already on the waitlist.
+STATUSES = ("enrolled", "waitlisted", "already enrolled", "course limit", "requested", "no advisor", "waitlisted")
+ENROLLED, WAITLISTED, ALREADY_ENROLLED, WAITING = 0, 1, 2, 6
+NONE = np.iinfo(np.int64).max
+
+
+def shard_of(course_code, shards):
+    # Stable across processes and runs, unlike hash() on a str.
+    return zlib.crc32(course_code.encode("utf-8")) % shards
+
+
+def run_shard(connection, courses, students):
+    # Owns the rosters and waitlists of its courses. Requests arrive as
+    # (course position, student position) pairs and every one is settled
+    # the way enrol() settles an undergraduate: already enrolled, already
+    # waiting, a seat if there is one, otherwise the waitlist. The
+    # coordinator has already checked the course limit. An empty message
+    # stops the worker. The reply is one status byte per request.
+    while True:
+        message = connection.recv_bytes()
+        if not message:
+            break
+        requests = array("i")
+        requests.frombytes(message)
+        statuses = bytearray(len(requests) // 2)
+        for n in range(0, len(requests), 2):
+            course = courses[requests[n]]
+            student = students[requests[n + 1]]
+            if student in course:
+                statuses[n // 2] = ALREADY_ENROLLED
+            elif student in course.waitlist:
+                statuses[n // 2] = WAITING
+            elif not course.add_student(student):
+                statuses[n // 2] = WAITLISTED
+                course.waitlist.add(student)
+        connection.send_bytes(statuses)
+    connection.close()
+
+
+def ranks(keys):
+    # How many earlier entries share each entry's key.
+    order = np.argsort(keys, kind="stable")
+    ordered = keys[order]
+    starts = np.flatnonzero(np.r_[True, ordered[1:] != ordered[:-1]])
+    result = np.empty(len(keys), np.int64)
+    result[order] = np.arange(len(keys)) - np.repeat(starts, np.diff(np.r_[starts, len(keys)]))
+    return result
+
+
+def after_marked(keys, marked, first):
+    # True for each entry that comes after a marked entry with the same key.
+    # first has a slot per key, all at NONE, and is left that way.
+    marked = np.flatnonzero(marked)
+    np.minimum.at(first, keys[marked], marked)
+    result = np.arange(len(keys)) > first[keys]
+    first[keys[marked]] = NONE
+    return result
+
+
+class ShardedEnrolment:
+    # Enrolment spread over worker processes, each owning the courses whose
+    # code hashes to it, so seats are handed out on several cores at once.
+    # The coordinator keeps the student side as arrays: courses taken per
+    # student for the MAX_COURSES limit, and which (student, course) pairs
+    # the workers have seated or waitlisted. Postgraduates and students at
+    # the limit are settled here and never reach a worker. A place is
+    # reserved against the limit before a request is sent, and a request
+    # that could break the limit if its student's earlier requests all
+    # succeed waits until they are settled. Every later request for the
+    # same course or from the same student waits with it, so each course
+    # takes its requests in arrival order and every status is the one
+    # enrol() would give. One batch is in flight while the next is
+    # prepared, and each worker answers a batch with one status byte per
+    # request, which is applied to the arrays and written to the log in
+    # bulk. The workers start on the first call with at least MIN_SHARDED
+    # requests; smaller calls before that just run enrol(). From then on
+    # the registry's students and courses must not be changed any other way
+    # until close(), which copies the seats and waitlist places handed out
+    # into them. The log is the usual one, so restore_state replays a
+    # sharded run that stopped before close().
+    def __init__(self, registry, workers=None, log=None):
+        self.__registry = registry
+        self.__log = log
+        self.__workers = workers or os.cpu_count() or 1
+        self.__connections = []
+        self.__processes = []
+
+    @property
+    def workers(self):
+        return self.__workers
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __start(self):
+        registry = self.__registry
+        students, courses = registry.students, registry.courses
+        self.__student_addresses = np.fromiter(map(id, students), np.uint64, len(students))
+        self.__course_addresses = np.fromiter(map(id, courses), np.uint64, len(courses))
+        self.__student_ids = np.array([student.student_id for student in students], object)
+        self.__course_codes = np.array([course.course_code for course in courses], object)
+        # Courses taken, and taken plus reserved, per student position.
+        self.__taken = np.fromiter((len(student.enrolled_courses) for student in students), np.int64, len(students))
+        self.__load = self.__taken.copy()
+        self.__postgraduate = np.fromiter((student.student_type.lower() == "postgraduate" for student in students),
+                                          bool, len(students))
+        # student * len(courses) + course for the pairs the workers have
+        # seated or newly waitlisted, and the settled batches close() copies.
+        self.__enrolled = set()
+        self.__waitlisted = set()
+        self.__settled = []
+        self.__first_course = np.full(len(courses), NONE)
+        self.__first_student = np.full(len(students), NONE)
+        self.__shard = np.fromiter((shard_of(course.course_code, self.__workers) for course in courses), np.int64,
+                                   len(courses))
+        self.__shard_position = np.empty(len(courses), np.int64)
+        shards = []
+        for n in range(self.__workers):
+            members = np.flatnonzero(self.__shard == n)
+            self.__shard_position[members] = np.arange(len(members))
+            shards.append([courses[position] for position in members])
+        if self.__log is not None:
+            self.__log.sync()
+        for shard in shards:
+            connection, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=run_shard, args=(child, shard, students), daemon=True)
+            process.start()
+            child.close()
+            self.__connections.append(connection)
+            self.__processes.append(process)
+
+    def __decide(self, student_position, course_position):
+        # Students at the limit and postgraduates are settled here, in the
+        # order enrol() checks them. Postgraduates never reach a worker, so
+        # their Student objects are current.
+        registry = self.__registry
+        student, course = registry.students[student_position], registry.courses[course_position]
+        pair = student_position * len(registry.courses) + course_position
+        if pair in self.__enrolled or course.course_name in student.enrolled_courses:
+            return STATUSES.index("already enrolled")
+        if pair in self.__waitlisted or student in course.waitlist:
+            return STATUSES.index("waitlisted")
+        if self.__taken[student_position] >= MAX_COURSES:
+            return STATUSES.index("course limit")
+        advisor = registry.get_advisor(student)
+        if not advisor:
+            return STATUSES.index("no advisor")
+        request_id = advisor.add_request(student, course)
+        if self.__log is not None:
+            self.__log.append("request", advisor.advisor_name, course.course_code, student.student_id, request_id)
+        return STATUSES.index("requested")
+
+    def __prepare(self, batch, students, courses, codes):
+        # Sends what it can of the batch to the workers. Returns the request
+        # numbers sent to each worker and those that have to wait.
+        student, course = students[batch], courses[batch]
+        local = (self.__taken[student] >= MAX_COURSES) | self.__postgraduate[student]
+        for n, student_position, course_position in zip(batch[local].tolist(), student[local].tolist(),
+                                                        course[local].tolist()):
+            codes[n] = self.__decide(student_position, course_position)
+        batch, student, course = batch[~local], student[~local], course[~local]
+        held = ranks(student) >= MAX_COURSES - self.__load[student]
+        while held.any():
+            more = (held | after_marked(course, held, self.__first_course)
+                    | after_marked(student, held, self.__first_student))
+            if np.array_equal(more, held):
+                break
+            held = more
+        deferred = batch[held]
+        batch, student, course = batch[~held], student[~held], course[~held]
+        np.add.at(self.__load, student, 1)
+        shard = self.__shard[course]
+        sent = []
+        for n, connection in enumerate(self.__connections):
+            mine = shard == n
+            if mine.any():
+                connection.send_bytes(np.column_stack((self.__shard_position[course[mine]], student[mine]))
+                                      .astype(np.int32).tobytes())
+            sent.append(batch[mine])
+        return sent, deferred
+
+    def __settle(self, sent, students, courses, codes):
+        course_count, log = len(self.__course_addresses), self.__log
+        for connection, numbers in zip(self.__connections, sent):
+            if not len(numbers):
+                continue
+            statuses = np.frombuffer(connection.recv_bytes(), np.uint8)
+            codes[numbers] = statuses
+            student, course = students[numbers], courses[numbers]
+            enrolled = statuses == ENROLLED
+            waitlisted = statuses == WAITLISTED
+            np.add.at(self.__taken, student[enrolled], 1)
+            np.add.at(self.__load, student[~enrolled], -1)
+            pairs = student * course_count + course
+            self.__enrolled.update(pairs[enrolled].tolist())
+            self.__waitlisted.update(pairs[waitlisted].tolist())
+            # A worker seats nobody in a course once it has waitlisted
+            # someone for it, so logging a batch's seats before its waitlist
+            # places replays to the same rosters and waitlists.
+            if log is not None:
+                codes_of, ids_of = self.__course_codes, self.__student_ids
+                log.append_many("enrol", zip(codes_of[course[enrolled]], ids_of[student[enrolled]]))
+                log.append_many("waitlist", zip(codes_of[course[waitlisted]], ids_of[student[waitlisted]]))
+            changed = enrolled | waitlisted
+            self.__settled.append((student[changed], course[changed], enrolled[changed]))
+
+    def enrol_many(self, requests):
+        # requests are (student, course) pairs from the registry. Returns
+        # enrol()'s status for each, in the same order.
+        requests = list(requests)
+        if not self.__processes:
+            if len(requests) < MIN_SHARDED:
+                return [enrol(self.__registry, student, course, self.__log) for student, course in requests]
+            self.__start()
+        students = positions(self.__student_addresses, (student for student, _ in requests), len(requests))
+        courses = positions(self.__course_addresses, (course for _, course in requests), len(requests))
+        codes = np.zeros(len(requests), np.int8)
+        pending = np.arange(len(requests))
+        in_flight = None
+        while len(pending) or in_flight is not None:
+            sent, deferred = self.__prepare(pending[:BATCH_SIZE], students, courses, codes)
+            pending = np.concatenate((deferred, pending[BATCH_SIZE:]))
+            if in_flight is not None:
+                self.__settle(in_flight, students, courses, codes)
+            in_flight = sent if any(len(numbers) for numbers in sent) else None
+        return [STATUSES[code] for code in codes.tolist()]
+
+    def enrol(self, student, course):
+        return self.enrol_many([(student, course)])[0]
+
+    def close(self):
+        # Stops the workers and gives the registry's students and courses
+        # the seats and waitlist places they handed out, in the order they
+        # did so.
+        if not self.__processes:
+            return
+        for connection in self.__connections:
+            connection.send_bytes(b"")
+        for connection, process in zip(self.__connections, self.__processes):
+            connection.close()
+            process.join()
+        self.__processes = []
+        self.__connections = []
+        students, courses = self.__registry.students, self.__registry.courses
+        for student_positions, course_positions, enrolled in self.__settled:
+            for student, course, seated in zip(student_positions.tolist(), course_positions.tolist(),
+                                               enrolled.tolist()):
+                if seated:
+                    courses[course].add_student(students[student])
+                    students[student].add_course(courses[course].course_name)
+                else:
+                    courses[course].waitlist.add(students[student])
+        self.__settled = []
+        self.__enrolled = set()
+        self.__waitlisted = set()
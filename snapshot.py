@@ -0,0 +1,236 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+# Layout (all integers little-endian uint32 unless noted):
+#   header       magic, version (uint16), padding, last applied log sequence (uint64),
+#                next request id, then the section counts
+#   strings      offsets[string_count + 1], then the UTF-8 blob (padded to 4 bytes)
+#   students     (id, name, type) string indexes
+#   courses      (code, name) string indexes, max_capacity
+#   advisors     name string index
+#   assignments  (advisor, student) pairs in assignment order
+#   rosters      (course, student) pairs in each course's enrolment order
+#   schedules    (student, course) pairs in each student's enrolment order
+#   requests     (advisor, student, course, request id, priority) in queue order
+#   waitlists    (course, student) pairs in promotion order
+MAGIC = b"ENRL"
+VERSION = 6
+HEADER = struct.Struct("<4sH2xQ10I")
+SNAPSHOT_FILE = "enrolment.snapshot"
+
+if array("I").itemsize != 4:
+    raise ImportError("snapshot requires a 4-byte unsigned int array type")
+
+
+class SnapshotError(Exception):
+    pass
+
+
+def _sync_directory(file_name):
+    if os.name == "nt":
+        # Windows cannot open a directory; NTFS journals the rename itself.
+        return
+    directory = os.open(os.path.dirname(os.path.abspath(file_name)), os.O_RDONLY)
+    try:
+        os.fsync(directory)
+    finally:
+        os.close(directory)
+
+
+def _u32(values):
+    packed = array("I", values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def save_snapshot(file_name, registry, sequence=0):
+    strings = {}
+
+    def intern(text):
+        index = strings.get(text)
+        if index is None:
+            index = strings[text] = len(strings)
+        return index
+
+    student_index = {}
+    student_fields = []
+    for student in registry.students:
+        student_index[student.student_id] = len(student_index)
+        student_fields += (intern(student.student_id), intern(student.student_name), intern(student.student_type))
+
+    course_index = {}
+    course_names = {}
+    course_fields = []
+    for course in registry.courses:
+        course_index[course.course_code] = len(course_index)
+        course_names.setdefault(course.course_name, course_index[course.course_code])
+        course_fields += (intern(course.course_code), intern(course.course_name), course.max_capacity)
+
+    advisor_fields = []
+    assignments = []
+    requests = []
+    for number, advisor in enumerate(registry.advisors):
+        advisor_fields.append(intern(advisor.advisor_name))
+        for student in advisor.assigned_students:
+            assignments += (number, student_index[student.student_id])
+        for request_id, student, course in advisor.pending_requests.items():
+            requests += (number, student_index[student.student_id], course_index[course.course_code], request_id,
+                         advisor.pending_requests.priority(request_id))
+
+    rosters = []
+    for course in registry.courses:
+        for student in course.enrolled_students:
+            rosters += (course_index[course.course_code], student_index[student.student_id])
+
+    waitlists = []
+    for course in registry.courses:
+        for student in course.waitlist:
+            waitlists += (course_index[course.course_code], student_index[student.student_id])
+
+    schedules = []
+    for student in registry.students:
+        for course_name in student.enrolled_courses:
+            schedules += (student_index[student.student_id], course_names[course_name])
+
+    blob = bytearray()
+    offsets = [0]
+    for text in strings:
+        blob += text.encode("utf-8")
+        offsets.append(len(blob))
+    blob += b"\0" * (-len(blob) % 4)
+
+    # One next id for every advisor, so no request id is ever reused.
+    next_request_id = max((advisor.pending_requests.next_id for advisor in registry.advisors), default=1)
+    header = HEADER.pack(MAGIC, VERSION, sequence, next_request_id, len(strings), len(registry.students),
+                         len(registry.courses), len(registry.advisors), len(assignments) // 2, len(rosters) // 2,
+                         len(schedules) // 2, len(requests) // 5, len(waitlists) // 2)
+    temp_name = file_name + ".tmp"
+    with open(temp_name, "wb") as snapshot_file:
+        for section in (header, _u32(offsets), blob, _u32(student_fields), _u32(course_fields),
+                        _u32(advisor_fields), _u32(assignments), _u32(rosters), _u32(schedules), _u32(requests),
+                        _u32(waitlists)):
+            snapshot_file.write(section)
+        snapshot_file.flush()
+        os.fsync(snapshot_file.fileno())
+    os.replace(temp_name, file_name)
+    # The rename is only durable once the directory is synced, and callers
+    # truncate the log as soon as this returns.
+    _sync_directory(file_name)
+
+
+class Snapshot:
+    def __init__(self, file_name):
+        self.__sections = ()
+        self.__sequence = 0
+        self.__next_request_id = 1
+        with open(file_name, "rb") as snapshot_file:
+            self.__map = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self.__read_sections()
+            return
+        except (struct.error, ValueError, UnicodeDecodeError) as error:
+            message = f"{file_name} is not a valid snapshot ({error})."
+        # Closed outside the except block so the traceback no longer pins views of the map.
+        self.close()
+        raise SnapshotError(message)
+
+    def __read_sections(self):
+        magic, version, self.__sequence, self.__next_request_id, *counts = HEADER.unpack_from(self.__map)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("unsupported header")
+        string_count, student_count, course_count, advisor_count, *edge_counts = counts
+        view = memoryview(self.__map)
+        position = HEADER.size
+
+        def section(length):
+            nonlocal position
+            values = view[position:position + length * 4]
+            if len(values) != length * 4:
+                raise ValueError("truncated section")
+            position += length * 4
+            if sys.byteorder == "big":
+                swapped = array("I", values)
+                swapped.byteswap()
+                return swapped
+            return values.cast("I")
+
+        offsets = section(string_count + 1)
+        blob_size = offsets[-1] + (-offsets[-1] % 4)
+        blob = view[position:position + offsets[-1]]
+        position += blob_size
+        text = str(blob, "utf-8")
+        if len(text) == len(blob):
+            self.__strings = [text[offsets[i]:offsets[i + 1]] for i in range(string_count)]
+        else:
+            self.__strings = [str(blob[offsets[i]:offsets[i + 1]], "utf-8") for i in range(string_count)]
+        self.__students = section(student_count * 3)
+        self.__courses = section(course_count * 3)
+        self.__advisors = section(advisor_count)
+        self.__assignments = section(edge_counts[0] * 2)
+        self.__rosters = section(edge_counts[1] * 2)
+        self.__schedules = section(edge_counts[2] * 2)
+        self.__requests = section(edge_counts[3] * 5)
+        self.__waitlists = section(edge_counts[4] * 2)
+        self.__sections = (offsets, self.__students, self.__courses, self.__advisors, self.__assignments,
+                           self.__rosters, self.__schedules, self.__requests, self.__waitlists)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        for values in self.__sections:
+            if isinstance(values, memoryview):
+                values.release()
+        self.__sections = ()
+        self.__map.close()
+
+    @property
+    def sequence(self):
+        return self.__sequence
+
+    @property
+    def next_request_id(self):
+        return self.__next_request_id
+
+    def students(self):
+        strings = self.__strings
+        fields = self.__students
+        return [(strings[student_id], strings[name], strings[student_type])
+                for student_id, name, student_type in zip(fields[0::3], fields[1::3], fields[2::3])]
+
+    def courses(self):
+        strings = self.__strings
+        fields = self.__courses
+        return [(strings[code], strings[name], max_capacity)
+                for code, name, max_capacity in zip(fields[0::3], fields[1::3], fields[2::3])]
+
+    def advisors(self):
+        strings = self.__strings
+        return [strings[index] for index in self.__advisors]
+
+    def assignments(self):
+        return _pairs(self.__assignments)
+
+    def rosters(self):
+        return _pairs(self.__rosters)
+
+    def schedules(self):
+        return _pairs(self.__schedules)
+
+    def requests(self):
+        fields = self.__requests
+        return list(zip(fields[0::5], fields[1::5], fields[2::5], fields[3::5], fields[4::5]))
+
+    def waitlists(self):
+        return _pairs(self.__waitlists)
+
+
+def _pairs(fields):
+    return list(zip(fields[0::2], fields[1::2]))
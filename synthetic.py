@@ -0,0 +1,67 @@
+import argparse
+import csv
+import os
+import random
+
+SYLLABLES = ["an", "bel", "car", "da", "el", "fin", "gar", "ha", "is", "jo", "ka", "lin", "mar", "no", "or", "pe",
+             "qui", "ros", "sa", "ton", "ul", "vi", "wen", "xa", "yo", "zed"]
+SUBJECTS = ["Algorithms", "Databases", "Networks", "Compilers", "Graphics", "Security", "Robotics", "Statistics",
+            "Operating Systems", "Machine Learning", "Distributed Systems", "Programming", "Logic", "Ethics"]
+LEVELS = ["Introduction to", "Topics in", "Advanced", "Applied", "Foundations of", "Seminar in"]
+CHUNK_SIZE = 50_000
+
+
+def pseudo_name(generator):
+    return "".join(generator.choice(SYLLABLES) for _ in range(generator.randint(2, 3))).capitalize()
+
+
+def write_institution(directory, student_count, seed=0, course_count=None, postgraduate_share=0.25):
+    # Writes students.csv, courses.csv and advisors.csv in the shipped
+    # schemas. The same seed and sizes always give the same files. Names
+    # repeat, the way they do in a real institution, but ids and codes are
+    # unique. Every advisor gets three postgraduates, so the cap is met.
+    generator = random.Random(seed)
+    course_count = course_count or max(7, student_count // 100)
+    first_names = [pseudo_name(generator) for _ in range(2_000)]
+    last_names = [pseudo_name(generator) for _ in range(20_000)]
+    postgraduates = []
+    with open(os.path.join(directory, "students.csv"), 'w', newline='') as student_file:
+        csv_writer = csv.writer(student_file)
+        csv_writer.writerow(["student_id", "name", "student_type"])
+        for first in range(0, student_count, CHUNK_SIZE):
+            rows = []
+            for n in range(first, min(first + CHUNK_SIZE, student_count)):
+                if generator.random() < postgraduate_share:
+                    student_id = f"P{n:08d}"
+                    postgraduates.append(student_id)
+                    rows.append((student_id, f"{generator.choice(first_names)} {generator.choice(last_names)}", "Postgraduate"))
+                else:
+                    rows.append((f"U{n:08d}", f"{generator.choice(first_names)} {generator.choice(last_names)}", "Undergraduate"))
+            csv_writer.writerows(rows)
+    with open(os.path.join(directory, "courses.csv"), 'w', newline='') as course_file:
+        csv_writer = csv.writer(course_file)
+        csv_writer.writerow(["course_code", "course_name", "max_capacity"])
+        csv_writer.writerows((f"CS{n:06d}", f"{generator.choice(LEVELS)} {generator.choice(SUBJECTS)} {n}",
+                              generator.randint(20, 400)) for n in range(course_count))
+    with open(os.path.join(directory, "advisors.csv"), 'w', newline='') as advisor_file:
+        csv_writer = csv.writer(advisor_file)
+        csv_writer.writerow(["advisor_name", "student_ids"])
+        csv_writer.writerows([f"Dr. {generator.choice(last_names)} {first // 3}"] + postgraduates[first:first + 3]
+                             for first in range(0, len(postgraduates), 3))
+    return student_count, course_count, (len(postgraduates) + 2) // 3
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a seeded synthetic institution as CSV files.")
+    parser.add_argument("directory")
+    parser.add_argument("--students", type=int, default=1_000)
+    parser.add_argument("--courses", type=int, help="default: one per 100 students, at least 7")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    os.makedirs(args.directory, exist_ok=True)
+    counts = write_institution(args.directory, args.students, args.seed, args.courses)
+    print("Wrote {} students, {} courses and {} advisors to {}.".format(*counts, args.directory))
+
+
+if __name__ == "__main__":
+    main()
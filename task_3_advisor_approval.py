@@ -1,287 +1,353 @@
-import csv
-from tabulate import tabulate
-
-class Student:
-    def __init__(self, student_id, name, student_type):
-        self.__student_id = student_id
-        self.__student_name = name
-        self.__student_type = student_type
-        self.__enrolled_courses = []
-
-    @property
-    def student_id(self):
-        return self.__student_id
-
-    @property
-    def student_name(self):
-        return self.__student_name
-
-    @property
-    def student_type(self):
-        return self.__student_type
-
-    @property
-    def enrolled_courses(self):
-        return self.__enrolled_courses
-
-    def can_enroll(self):
-        return len(self.__enrolled_courses) < 4
-
-    def add_course(self, course_name):
-        if course_name not in self.__enrolled_courses:
-            self.__enrolled_courses.append(course_name)
-
-    def drop_course(self, course_name):
-        if course_name in self.__enrolled_courses:
-            self.__enrolled_courses.remove(course_name)
-
-    def __str__(self):
-        return f"{self.__student_name} (ID: {self.__student_id}, Type: {self.__student_type})"
-
-
-class Course:
-    def __init__(self, course_code, name, max_capacity):
-        self.__course_code = course_code
-        self.__course_name = name
-        self.__max_capacity = int(max_capacity)
-        self.__enrolled_students = []
-
-    @property
-    def course_code(self):
-        return self.__course_code
-
-    @property
-    def course_name(self):
-        return self.__course_name
-
-    @property
-    def max_capacity(self):
-        return self.__max_capacity
-
-    @property
-    def enrolled_students(self):
-        return self.__enrolled_students
-
-    def add_student(self, student):
-        if len(self.__enrolled_students) >= self.__max_capacity:
-            return False
-        if student in self.__enrolled_students:
-            return False
-        self.__enrolled_students.append(student)
-        return True
-
-    def drop_student(self, student):
-        if student in self.__enrolled_students:
-            self.__enrolled_students.remove(student)
-            return True
-        return False
-
-    def __str__(self):
-        return f"{self.__course_name} (Code: {self.__course_code}, Enrolled: {len(self.__enrolled_students)}/{self.__max_capacity})"
-
-
-class Advisor:
-    def __init__(self, name):
-        self.__advisor_name = name
-        self.__assigned_students = []
-        self.__pending_requests = []
-
-    @property
-    def advisor_name(self):
-        return self.__advisor_name
-
-    @property
-    def assigned_students(self):
-        return self.__assigned_students
-
-    @property
-    def pending_requests(self):
-        return self.__pending_requests
-
-    def add_assigned_student(self, student):
-        if len(self.__assigned_students) < 3:
-            self.__assigned_students.append(student)
-
-    def add_request(self, student, course):
-        self.__pending_requests.append((student, course))
-
-    def approve_request(self, student, course):
-        if (student, course) in self.__pending_requests:
-            self.__pending_requests.remove((student, course))
-            return True
-        return False
-
-    def deny_request(self, student, course):
-        if (student, course) in self.__pending_requests:
-            self.__pending_requests.remove((student, course))
-            return True
-        return False
-
-    def __str__(self):
-        return self.__advisor_name
-
-
-def load_students(file_name):
-    students = []
-    with open(file_name, 'r') as student_file:
-        csv_reader = csv.reader(student_file)
-        next(csv_reader)
-        for row in csv_reader:
-            students.append(Student(row[0], row[1], row[2]))
-    return students
-
-
-def load_courses(file_name):
-    courses = []
-    with open(file_name, 'r') as course_file:
-        csv_reader = csv.reader(course_file)
-        next(csv_reader)
-        for row in csv_reader:
-            courses.append(Course(row[0], row[1], row[2]))
-    return courses
-
-
-def load_advisors(file_name, students):
-    advisors = []
-    with open(file_name, 'r') as advisor_file:
-        csv_reader = csv.reader(advisor_file)
-        next(csv_reader)
-        for row in csv_reader:
-            advisor = Advisor(row[0])
-            for student_id in row[1:]:
-                for student in students:
-                    if student.student_id == student_id:
-                        advisor.add_assigned_student(student)
-            advisors.append(advisor)
-    return advisors
-
-
-def get_student(students, name):
-    for student in students:
-        if student.student_name.lower() == name.lower():
-            return student
-    return None
-
-
-def get_course(courses, name):
-    for course in courses:
-        if course.course_name.lower() == name.lower():
-            return course
-    return None
+import argparse
+import os
+import sys
+
+from instrument import ENV_VAR, PROFILE_ENV_VAR, enable, hot
+from models import MAX_COURSES, Advisor, Course, Student, load_advisors, load_courses, load_students
+from oplog import COMPACT_EVERY, LOG_FILE, OpLog, recover
+from prompts import resolve
+from registry import Registry
+from report import RENDERERS, ReportCache
+from roster import PAGE_SIZE, SORTS
+from snapshot import SNAPSHOT_FILE, Snapshot, SnapshotError, save_snapshot
+
+
+@hot("load.snapshot")
+def load_snapshot(file_name):
+    with Snapshot(file_name) as snapshot:
+        try:
+            students = [Student(student_id, name, student_type) for student_id, name, student_type in snapshot.students()]
+            courses = [Course(course_code, name, max_capacity) for course_code, name, max_capacity in snapshot.courses()]
+            advisors = [Advisor(name) for name in snapshot.advisors()]
+            for advisor in advisors:
+                advisor.pending_requests.advance(snapshot.next_request_id)
+            for advisor, student in snapshot.assignments():
+                advisors[advisor].add_assigned_student(students[student])
+            for course, student in snapshot.rosters():
+                courses[course].add_student(students[student])
+            for student, course in snapshot.schedules():
+                students[student].add_course(courses[course].course_name)
+            for advisor, student, course, request_id, priority in snapshot.requests():
+                advisors[advisor].pending_requests.add(students[student], courses[course], priority, request_id)
+            for course, student in snapshot.waitlists():
+                courses[course].waitlist.add(students[student])
+        except IndexError:
+            raise SnapshotError(f"{file_name} refers to a record that does not exist.") from None
+        return Registry(students, courses, advisors), snapshot.sequence
+
+
+def load_registry(snapshot_file=SNAPSHOT_FILE):
+    if os.path.exists(snapshot_file):
+        try:
+            return load_snapshot(snapshot_file)
+        except SnapshotError as error:
+            print(f"Warning: {error} Loading the CSV files instead.")
+    students = load_students("students.csv")
+    courses = load_courses("courses.csv")
+    advisors = load_advisors("advisors.csv", students)
+    return Registry(students, courses, advisors), 0
 
 
-def get_advisor(student, advisors):
-    for advisor in advisors:
-        if student in advisor.assigned_students:
-            return advisor
-    return None
+def restore_state(**log_options):
+    registry, sequence = load_registry()
+    last_sequence = recover(LOG_FILE, registry, sequence)
+    log = OpLog(LOG_FILE, last_sequence, records=last_sequence - sequence, **log_options)
+    return registry, log
 
 
-def enrol_student(students, courses, advisors):
-    while True:
-        course_name = input("Enter the name of the course: ").strip()
-        course = get_course(courses, course_name)
-        if course:
-            break
-        print(f'"{course_name}" not found. Try again.')
+@hot("save.snapshot")
+def save_state(registry, log):
+    save_snapshot(SNAPSHOT_FILE, registry, log.sequence)
+    log.truncate()
 
-    while True:
-        student_name = input("Enter the name of the student: ").strip()
-        student = get_student(students, student_name)
-        if student:
-            break
-        print(f'"{student_name}" not found. Try again.')
 
+@hot("enrol")
+def enrol(registry, student, course, log=None):
     if course.course_name in student.enrolled_courses:
-        print(f"Student {student.student_name} is already enrolled in {course.course_name}.")
-        print(f'Failure! Student "{student.student_name}" NOT enrolled in course "{course.course_name}".')
-        return
-
+        return "already enrolled"
+    if student in course.waitlist:
+        return "waitlisted"
     if not student.can_enroll():
-        print(f"Student {student.student_name} cannot enroll in more than 4 courses.")
-        return
-
+        return "course limit"
+    if student.student_type.lower() == "postgraduate":
+        advisor = registry.get_advisor(student)
+        if not advisor:
+            return "no advisor"
+        request_id = advisor.add_request(student, course)
+        if log is not None:
+            log.append("request", advisor.advisor_name, course.course_code, student.student_id, request_id)
+        return "requested"
+    if not course.add_student(student):
+        return add_to_waitlist(student, course, log)
+    student.add_course(course.course_name)
+    if log is not None:
+        log.append("enrol", course.course_code, student.student_id)
+    return "enrolled"
+
+
+@hot("enrol.bundle")
+def enrol_bundle(registry, student, courses, log=None):
+    # All or nothing: the student gets every course or none of them. Returns
+    # (status, course) where course is the one that stopped the bundle.
+    # Bundles are never waitlisted, since that would leave one half pending.
+    # For the same reason postgraduates cannot bundle: their advisor approves
+    # each course on its own, and may approve one half and deny the other.
+    courses = list(dict.fromkeys(courses))
+    for course in courses:
+        if course.course_name in student.enrolled_courses:
+            return "already enrolled", course
+    if not student.can_take(len(courses)):
+        return "course limit", None
     if student.student_type.lower() == "postgraduate":
-        advisor = get_advisor(student, advisors)
-        if advisor:
-            advisor.add_request(student, course)
-            print(f"Request sent to advisor {advisor.advisor_name} for approval.")
+        return "needs approval", None
+    added = []
+    for course in courses:
+        if not course.add_student(student):
+            for taken in added:
+                taken.drop_student(student)
+            return "course full", course
+        added.append(course)
+    for course in courses:
+        student.add_course(course.course_name)
+    if log is not None:
+        # One record, so a crash replays the whole bundle or none of it.
+        log.append("bundle", student.student_id, *(course.course_code for course in courses))
+    return "enrolled", None
+
+
+def add_to_waitlist(student, course, log=None, advisor=None):
+    # Postgraduates only join a waitlist once their advisor has approved, so
+    # everyone on it can be promoted without another approval round.
+    # An approval is logged even if the student was already waiting, since
+    # it still settles the request.
+    if advisor is not None:
+        advisor.approve_request(student, course)
+    added = course.waitlist.add(student)
+    if log is not None and advisor is not None:
+        log.append("waitlist", course.course_code, student.student_id, advisor.advisor_name)
+    elif log is not None and added:
+        log.append("waitlist", course.course_code, student.student_id)
+    return "waitlisted"
+
+
+def promote(course, log=None):
+    promoted = []
+    while len(course.enrolled_students) < course.max_capacity and course.waitlist:
+        student = promote_next(course, log)
+        if student is not None:
+            promoted.append(student)
+    return promoted
+
+
+def promote_next(course, log=None):
+    # Settles the student at the head of the waitlist: they take a free seat,
+    # or leave the list if they have since reached the 4-course limit or
+    # enrolled another way. Returns the student only if they were enrolled.
+    student = course.waitlist.pop()
+    if student is None:
+        return None
+    if course.course_name in student.enrolled_courses or not student.can_enroll():
+        if log is not None:
+            log.append("unwaitlist", course.course_code, student.student_id)
+        return None
+    if not course.add_student(student):
+        course.waitlist.add(student)
+        return None
+    student.add_course(course.course_name)
+    if log is not None:
+        log.append("enrol", course.course_code, student.student_id)
+    return student
+
+
+@hot("drop")
+def drop(student, course, log=None, promote_waitlist=True):
+    if course.course_name not in student.enrolled_courses:
+        return "not enrolled"
+    if not course.drop_student(student):
+        return "not dropped"
+    student.drop_course(course.course_name)
+    if log is not None:
+        log.append("drop", course.course_code, student.student_id)
+    if promote_waitlist:
+        promote(course, log)
+    return "dropped"
+
+
+@hot("approve")
+def approve(advisor, student, course, log=None):
+    if advisor.pending_requests.find(student, course) is None:
+        return "not pending"
+    if course.course_name in student.enrolled_courses:
+        return "already enrolled"
+    if not student.can_enroll():
+        return "course limit"
+    if not course.add_student(student):
+        return add_to_waitlist(student, course, log, advisor)
+    student.add_course(course.course_name)
+    advisor.approve_request(student, course)
+    if log is not None:
+        log.append("approve", advisor.advisor_name, course.course_code, student.student_id)
+    return "approved"
+
+
+@hot("approve.many")
+def approve_many(advisor, request_ids, log=None):
+    # Requests are grouped by course so each course's free seats are counted
+    # once. Within a course, seats go to requests in the order given.
+    results = dict.fromkeys(request_ids)
+    by_course = {}
+    for request_id in request_ids:
+        request = advisor.pending_requests.get(request_id)
+        if request is None:
+            results[request_id] = "not pending"
         else:
-            print(f"No advisor found for {student.student_name}.")
+            by_course.setdefault(request[1].course_code, []).append((request_id, *request))
+    for requests in by_course.values():
+        course = requests[0][2]
+        free = course.max_capacity - len(course.enrolled_students)
+        for request_id, student, course in requests:
+            if free <= 0:
+                if course.course_name in student.enrolled_courses:
+                    results[request_id] = "already enrolled"
+                elif student.can_enroll():
+                    results[request_id] = add_to_waitlist(student, course, log, advisor)
+                else:
+                    results[request_id] = "course limit"
+                continue
+            results[request_id] = approve(advisor, student, course, log)
+            if results[request_id] == "approved":
+                free -= 1
+    return results
+
+
+@hot("deny.many")
+def deny_many(advisor, request_ids, log=None):
+    results = {}
+    for request_id in request_ids:
+        request = advisor.pending_requests.get(request_id)
+        results[request_id] = deny(advisor, *request, log) if request else "not pending"
+    return results
+
+
+@hot("deny")
+def deny(advisor, student, course, log=None):
+    if not advisor.deny_request(student, course):
+        return "not pending"
+    if log is not None:
+        log.append("deny", advisor.advisor_name, course.course_code, student.student_id)
+    return "denied"
+
+
+def enrol_student(registry, log=None):
+    course = resolve("Enter the name or code of the course: ", registry.find_courses, registry.search_courses)
+    student = resolve("Enter the name or ID of the student: ", registry.find_students, registry.search_students)
+
+    status = enrol(registry, student, course, log)
+    if status == "already enrolled":
+        print(f"Student {student.student_name} is already enrolled in {course.course_name}.")
+        print(f'Failure! Student "{student.student_name}" NOT enrolled in course "{course.course_name}".')
+    elif status == "course limit":
+        print(f"Student {student.student_name} cannot enroll in more than {MAX_COURSES} courses.")
+    elif status == "requested":
+        print(f"Request sent to advisor {registry.get_advisor(student).advisor_name} for approval.")
+    elif status == "no advisor":
+        print(f"No advisor found for {student.student_name}.")
+    elif status == "enrolled":
+        print(f'Success! Student "{student.student_name}" enrolled in course "{course.course_name}".')
+    elif status == "waitlisted":
+        print(f'{course.course_name} is full. Student "{student.student_name}" added to the waitlist '
+              f'(position {len(course.waitlist)}).')
     else:
-        if course.add_student(student):
-            student.add_course(course.course_name)
-            print(f'Success! Student "{student.student_name}" enrolled in course "{course.course_name}".')
-        else:
-            print(f"Failure! Student \"{student.student_name}\" NOT enrolled in course \"{course.course_name}\".")
+        print(f"Failure! Student \"{student.student_name}\" NOT enrolled in course \"{course.course_name}\".")
 
 
-def drop_course(students, courses):
+def enrol_bundle_menu(registry, log=None):
+    student = resolve("Enter the name or ID of the student: ", registry.find_students, registry.search_students)
+    courses = []
     while True:
-        course_name = input("Enter the name of the course to drop: ").strip()
-        course = get_course(courses, course_name)
-        if course:
+        course = resolve("Enter a course name or code (press Enter when done): ", registry.find_courses,
+                         registry.search_courses, allow_empty=True)
+        if course is None:
             break
-        print(f'"{course_name}" not found. Try again.')
+        courses.append(course)
+    if not courses:
+        print("No courses given.")
+        return
 
-    while True:
-        student_name = input("Enter the name of the student: ").strip()
-        student = get_student(students, student_name)
-        if student:
-            break
-        print(f'"{student_name}" not found. Try again.')
+    names = ", ".join(f'"{course.course_name}"' for course in courses)
+    status, course = enrol_bundle(registry, student, courses, log)
+    if status == "enrolled":
+        print(f'Success! Student "{student.student_name}" enrolled in {names}.')
+    elif status == "already enrolled":
+        print(f'Failure! Student "{student.student_name}" is already enrolled in "{course.course_name}". Nothing changed.')
+    elif status == "course limit":
+        print(f"Failure! Student {student.student_name} cannot enroll in more than {MAX_COURSES} courses. Nothing changed.")
+    elif status == "course full":
+        print(f'Failure! "{course.course_name}" is full. Student "{student.student_name}" NOT enrolled in {names}.')
+    else:
+        print(f"Failure! Postgraduates need their advisor's approval for each course. "
+              f"Enroll {student.student_name} in one course at a time. Nothing changed.")
 
-    if course.course_name not in student.enrolled_courses:
-        print(f'Failure! Student "{student.student_name}" NOT enrolled in "{course.course_name}".')
-        return
 
-    if course.drop_student(student):
-        student.drop_course(course.course_name)
+def drop_course(registry, log=None):
+    course = resolve("Enter the name or code of the course to drop: ", registry.find_courses, registry.search_courses)
+    student = resolve("Enter the name or ID of the student: ", registry.find_students, registry.search_students)
+
+    status = drop(student, course, log)
+    if status == "not enrolled":
+        print(f'Failure! Student "{student.student_name}" NOT enrolled in "{course.course_name}".')
+    elif status == "dropped":
         print(f'Success! Student "{student.student_name}" dropped from course "{course.course_name}".')
     else:
         print(f'Failure! Student "{student.student_name}" NOT dropped from course "{course.course_name}".')
 
 
-def list_enrolled(courses):
-    course_name = input("Enter the name of the course: ").strip()
-    course = get_course(courses, course_name)
-    if course:
-        print(f"{course.course_name} (Code: {course.course_code}, Enrolled: {len(course.enrolled_students)}/{course.max_capacity})")
-        if not course.enrolled_students:
-            print("  None")
-        else:
-            for student in course.enrolled_students:
-                print(f"  {student}")
-    else:
-        print(f'"{course_name}" not found.')
+def list_enrolled(registry):
+    course = resolve("Enter the name or code of the course: ", registry.find_courses, registry.search_courses,
+                     retry=False)
+    if not course:
+        return
+    print(f"{course.course_name} (Code: {course.course_code}, Enrolled: {len(course.enrolled_students)}/{course.max_capacity})")
+    if not course.enrolled_students:
+        print("  None")
+        return
 
+    sort = "time"
+    student_type = None
+    if len(course.enrolled_students) > PAGE_SIZE:
+        sort = input(f"Sort by ({'/'.join(SORTS)}, Enter for enrolment time): ").strip().lower() or "time"
+        if sort not in SORTS:
+            print(f'Unknown sort "{sort}", using enrolment time.')
+            sort = "time"
+        student_type = input("Only show student type (Enter for all): ").strip() or None
+
+    cursor = None
+    shown = 0
+    total = course.roster.count(sort, student_type)
+    while True:
+        students, cursor = course.roster.page(sort, student_type, cursor)
+        shown += len(students)
+        sys.stdout.write("".join(f"  {student}\n" for student in students))
+        if cursor is None:
+            if not shown:
+                print("  None")
+            break
+        if input(f"Showing {shown} of {total}. Press Enter for more or q to stop: ").strip().lower() == "q":
+            break
 
-def list_all_courses(courses):
-    table = []
-    for course in courses:
-        names = ", ".join([student.student_name for student in course.enrolled_students]) or "None"
-        table.append([
-            course.course_code,
-            course.course_name,
-            course.max_capacity,
-            len(course.enrolled_students),
-            names
-        ])
-    print(tabulate(table, headers=["Course Code", "Course Name", "Max Capacity", "Enrolled Students", "Student Names"],
-                   tablefmt="grid"))
 
+@hot("render.all_courses")
+def list_all_courses(courses, cache=None, tablefmt="grid"):
+    cache = cache if cache is not None else ReportCache()
+    RENDERERS[tablefmt](cache.rows(courses))
+    sys.stdout.flush()
 
-# ✅ FINAL CORRECT advisor_menu
-def advisor_menu(advisors, students, courses):
-    advisor_name = input("Enter your name: ").strip()
-    advisor = None
-    for a in advisors:
-        if a.advisor_name.lower() == advisor_name.lower():
-            advisor = a
-            break
 
+# ✅ FINAL CORRECT advisor_menu
+def advisor_menu(registry, log=None):
+    advisor = resolve("Enter your name: ", registry.find_advisors, registry.search_advisors, retry=False,
+                      not_found="No advisor found with the name {}.")
     if not advisor:
-        print(f"No advisor found with the name {advisor_name}.")
         return
 
     if not advisor.pending_requests:
@@ -289,8 +355,8 @@ def advisor_menu(advisors, students, courses):
         return
 
     print(f"Welcome, {advisor.advisor_name}. Here are your pending requests:")
-    for i, (student, course) in enumerate(advisor.pending_requests, 1):
-        print(f"{i}. Student {student.student_name} requests to enroll in {course.course_name}.")
+    for request_id, student, course in advisor.pending_requests.items():
+        print(f"{request_id}. Student {student.student_name} requests to enroll in {course.course_name}.")
 
     while advisor.pending_requests:
         action = input("Would you like to approve or deny a request? (a = approve, d = deny, q = quit): ").lower()
@@ -301,31 +367,54 @@ def advisor_menu(advisors, students, courses):
             print("Invalid option. Please enter 'a' to approve, 'd' to deny, or 'q' to quit.")
             continue
 
-        try:
-            num = int(input("Enter the number of the request to approve/deny: "))
-            student, course = advisor.pending_requests[num-1]
-        except (ValueError, IndexError):
+        numbers = input("Enter the number(s) of the request(s) to approve/deny (e.g. 2, 1,3 or all): ").strip().lower()
+        if numbers == "all":
+            request_ids = [request_id for request_id, _, _ in advisor.pending_requests.items()]
+        else:
+            try:
+                request_ids = [int(number) for number in numbers.split(",")]
+            except ValueError:
+                request_ids = []
+        requests = {request_id: advisor.pending_requests.get(request_id) for request_id in request_ids}
+        if not requests or None in requests.values():
             print("Invalid request number.")
             continue
 
         if action == "a":
-            if course.add_student(student):
-                student.add_course(course.course_name)
-                advisor.approve_request(student, course)
-                print(f"Request approved. {student.student_name} is now enrolled in {course.course_name}.")
+            for request_id, status in approve_many(advisor, request_ids, log).items():
+                student, course = requests[request_id]
+                if status == "approved":
+                    print(f"Request approved. {student.student_name} is now enrolled in {course.course_name}.")
+                elif status == "course limit":
+                    print(f"Student {student.student_name} cannot enroll in more than {MAX_COURSES} courses.")
+                elif status == "already enrolled":
+                    print(f"Student {student.student_name} is already enrolled in {course.course_name}.")
+                else:
+                    print(f"{course.course_name} is full. {student.student_name} has been added to its waitlist.")
         elif action == "d":
-            advisor.deny_request(student, course)
-            print(f"Request denied for {student.student_name}.")
+            deny_many(advisor, request_ids, log)
+            for student, course in requests.values():
+                print(f"Request denied for {student.student_name}.")
 
         if not advisor.pending_requests:
             break
 
 
-def main():
-    students = load_students("students.csv")
-    courses = load_courses("courses.csv")
-    advisors = load_advisors("advisors.csv", students)
-    print(f"Initialised {len(students)} students, {len(advisors)} advisors including {len(courses)} courses.")
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Course enrolment console.")
+    parser.add_argument("--plain", action="store_true", help="list all courses without tabulate's grid")
+    parser.add_argument("--instrument", action="store_true",
+                        help=f"time loads, lookups, enrolments, approvals and reports and print a summary on exit "
+                             f"(or set {ENV_VAR}=1)")
+    parser.add_argument("--profile", metavar="FILE",
+                        help=f"also write a cProfile dump of the session to FILE (or set {PROFILE_ENV_VAR}=FILE)")
+    args = parser.parse_args(argv)
+    if args.instrument or args.profile:
+        enable(args.profile)
+    tablefmt = "plain" if args.plain else "grid"
+    report_cache = ReportCache()
+    registry, log = restore_state()
+    print(f"Initialised {len(registry.students)} students, {len(registry.advisors)} advisors including {len(registry.courses)} courses.")
 
     while True:
         print("\n===============================")
@@ -336,27 +425,36 @@ def main():
         print("4. List Enrolled Students.")
         print("5. List All Courses and Enrolled Students.")
         print("6. Advisor Login.")
+        print("7. Enroll Student in Several Courses at Once.")
         print("0. Quit.")
         print("===============================")
         choice = input()
 
         if choice == "1":
-            enrol_student(students, courses, advisors)
+            enrol_student(registry, log)
         elif choice == "2":
-            drop_course(students, courses)
+            drop_course(registry, log)
         elif choice == "3":
-            enrol_student(students, courses, advisors)
+            enrol_student(registry, log)
         elif choice == "4":
-            list_enrolled(courses)
+            list_enrolled(registry)
         elif choice == "5":
-            list_all_courses(courses)
+            list_all_courses(registry.courses, report_cache, tablefmt)
         elif choice == "6":
-            advisor_menu(advisors, students, courses)
+            advisor_menu(registry, log)
+        elif choice == "7":
+            enrol_bundle_menu(registry, log)
         elif choice == "0":
+            save_state(registry, log)
+            log.close()
             break
         else:
             print("Invalid choice. Try again.")
 
+        log.sync()
+        if log.records >= COMPACT_EVERY:
+            save_state(registry, log)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,82 @@
+import os
+import random
+
+import pytest
+
+from models import Advisor, Course, Student
+from oplog import OpLog, recover
+from registry import Registry
+from snapshot import save_snapshot
+from task_3_advisor_approval import (approve, approve_many, deny, deny_many, drop, enrol, enrol_bundle,
+                                     load_snapshot)
+
+
+def build_registry():
+    students = [Student(f"S{n:03}", f"Student {n}", "Postgraduate" if n % 3 == 0 else "Undergraduate")
+                for n in range(30)]
+    courses = [Course(f"C{n}", f"Course {n}", 1 + n % 3) for n in range(6)]
+    advisors = [Advisor(f"Advisor {n}") for n in range(5)]
+    for number, student in enumerate(students[:15]):
+        advisors[number % 5].add_assigned_student(student)
+    return Registry(students, courses, advisors)
+
+
+def state(registry):
+    return {
+        "rosters": {course.course_code: [student.student_id for student in course.enrolled_students]
+                    for course in registry.courses},
+        "waitlists": {course.course_code: [student.student_id for student in course.waitlist]
+                      for course in registry.courses},
+        "schedules": {student.student_id: list(student.enrolled_courses) for student in registry.students},
+        "requests": {advisor.advisor_name: [(request_id, student.student_id, course.course_code)
+                                            for request_id, student, course in advisor.pending_requests.items()]
+                     for advisor in registry.advisors},
+    }
+
+
+def pending(registry, generator):
+    advisor = generator.choice(registry.advisors)
+    return advisor, [request_id for request_id, _, _ in advisor.pending_requests.items()]
+
+
+def random_operation(registry, generator, log):
+    student = generator.choice(registry.students)
+    course = generator.choice(registry.courses)
+    operation = generator.choice(("enrol", "enrol", "enrol", "bundle", "drop", "drop", "approve", "deny",
+                                  "approve_many", "deny_many"))
+    if operation == "enrol":
+        enrol(registry, student, course, log)
+    elif operation == "bundle":
+        enrol_bundle(registry, student, generator.sample(registry.courses, 2), log)
+    elif operation == "drop":
+        drop(student, course, log)
+    elif operation in ("approve", "deny"):
+        advisor, request_ids = pending(registry, generator)
+        if request_ids and generator.random() < 0.8:
+            student, course = advisor.pending_requests.get(generator.choice(request_ids))
+        action = approve if operation == "approve" else deny
+        action(advisor, student, course, log)
+    else:
+        advisor, request_ids = pending(registry, generator)
+        action = approve_many if operation == "approve_many" else deny_many
+        action(advisor, generator.sample(request_ids, min(len(request_ids), 2)) + [999], log)
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_snapshot_and_replay_rebuild_the_live_state(tmp_path, seed):
+    snapshot_file = os.path.join(tmp_path, "enrolment.snapshot")
+    log_file = os.path.join(tmp_path, "enrolment.log")
+    generator = random.Random(seed)
+    registry = build_registry()
+    log = OpLog(log_file)
+    save_snapshot(snapshot_file, registry, log.sequence)
+    for step in range(400):
+        random_operation(registry, generator, log)
+        if step == 200:
+            save_snapshot(snapshot_file, registry, log.sequence)
+            log.truncate()
+    log.close()
+
+    restored, sequence = load_snapshot(snapshot_file)
+    recover(log_file, restored, sequence)
+    assert state(restored) == state(registry)
@@ -0,0 +1,30 @@
+from models import Student
+from registry import Registry
+from search import SearchIndex
+
+
+def student_index(students):
+    return SearchIndex(lambda student: (student.student_id, student.student_name), students)
+
+
+def test_exact_name_beats_a_crowd_of_longer_names():
+    # Every "John SmithN" matches "john" exactly as a word, like "John" does,
+    # and all of them come first in the postings.
+    students = [Student(f"S{n:03}", f"John Smith{n}", "Undergraduate") for n in range(50)]
+    john = Student("S999", "John", "Undergraduate")
+    found = student_index(students + [john]).search("john")
+    assert found[0] is john
+    assert len(found) == 10
+
+
+def test_name_prefix_ranks_before_later_word():
+    students = [Student(f"S{n:03}", f"Ann Mary {n}", "Undergraduate") for n in range(30)]
+    mary = Student("S999", "Mary Ann", "Undergraduate")
+    assert student_index(students + [mary]).search("mary", limit=3)[0] is mary
+
+
+def test_registry_search_finds_typos_and_ids():
+    students = [Student("S001", "Alice Johnson", "Undergraduate"), Student("S002", "Bob Stone", "Postgraduate")]
+    registry = Registry(students, [], [])
+    assert registry.search_students("alcie") == [students[0]]
+    assert registry.search_students("s002") == [students[1]]
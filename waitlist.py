@@ -0,0 +1,52 @@
+from collections import deque
+
+
+class Waitlist:
+    # Students waiting for a seat, first come, first served. Each entry is a
+    # (ticket, student) pair. Removal is lazy: discarded entries stay in the
+    # queue until they reach the front, so add, discard and pop are all O(1)
+    # amortised.
+    def __init__(self):
+        self.__queue = deque()
+        self.__waiting = {}
+        self.__counter = 0
+
+    def __len__(self):
+        return len(self.__waiting)
+
+    def __contains__(self, student):
+        return student.student_id in self.__waiting
+
+    def __iter__(self):
+        # Students in the order they would be promoted.
+        return (student for ticket, student in self.__queue if self.__waiting.get(student.student_id) == ticket)
+
+    def add(self, student):
+        if student.student_id in self.__waiting:
+            return False
+        self.__counter += 1
+        self.__waiting[student.student_id] = self.__counter
+        self.__queue.append((self.__counter, student))
+        return True
+
+    def discard(self, student):
+        if self.__waiting.pop(student.student_id, None) is None:
+            return False
+        if len(self.__queue) > 2 * len(self.__waiting) + 16:
+            self.__queue = deque((ticket, student) for ticket, student in self.__queue
+                                 if self.__waiting.get(student.student_id) == ticket)
+        return True
+
+    def peek(self):
+        queue = self.__queue
+        while queue and self.__waiting.get(queue[0][1].student_id) != queue[0][0]:
+            queue.popleft()
+        return queue[0][1] if queue else None
+
+    def pop(self):
+        while self.__queue:
+            ticket, student = self.__queue.popleft()
+            if self.__waiting.get(student.student_id) == ticket:
+                del self.__waiting[student.student_id]
+                return student
+        return None